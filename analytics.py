@@ -0,0 +1,117 @@
+# analytics.py
+# Host'lar için aylık doluluk ve gelir özetleri (property_month_stats).
+# Bir evin verisi değiştiğinde sadece o evin satırları yeniden hesaplanır; host raporları
+# rezervasyonları taramak yerine bu özet tablodan birkaç indeksli sorguyla okunur.
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from intervals import day_counts, intersect_intervals, merge_intervals
+from models import db, Property, Availability, Reservation, PropertyMonthStats, chunked
+
+
+def refresh_property(property_id):
+    """Evin aylık özet satırlarını baştan hesaplar (arka plan işi olarak çalışır, tekrar çalıştırılabilir)."""
+    refresh_properties([property_id])
+
+
+def refresh_properties(property_ids):
+    """Birden fazla evin özetlerini yeniler; her parça için okuma ve yazma sabit sayıda sorguyla yapılır."""
+    for chunk in chunked(property_ids):
+        PropertyMonthStats.query.filter(PropertyMonthStats.property_id.in_(chunk)).delete(synchronize_session=False)
+        prices = dict(db.session.query(Property.id, Property.price).filter(Property.id.in_(chunk)))
+
+        avails, pending, approved = defaultdict(list), defaultdict(list), defaultdict(list)
+        for pid, start, end in db.session.query(Availability.property_id, Availability.start_date,
+                                                Availability.end_date) \
+                .filter(Availability.property_id.in_(list(prices))):
+            avails[pid].append((start, end))
+        for pid, status, start, end in db.session.query(Reservation.property_id, Reservation.status,
+                                                        Reservation.start_date, Reservation.end_date) \
+                .filter(Reservation.property_id.in_(list(prices)), Reservation.status.in_(['pending', 'approved'])):
+            (pending if status == 'pending' else approved)[pid].append((start, end))
+
+        rows = []
+        for property_id, price in prices.items():
+            rows.extend(_month_rows(property_id, price, merge_intervals(avails[property_id]),
+                                    merge_intervals(pending[property_id]), merge_intervals(approved[property_id])))
+        if rows:
+            db.session.execute(PropertyMonthStats.__table__.insert(), rows)
+        db.session.commit()
+
+
+def _month_rows(property_id, price, avails, pending, approved):
+    rows = []
+    for month_start, month_end in _months(avails + pending + approved):
+        window = [(month_start, month_end)]
+        free, pending_nights, booked = day_counts(intersect_intervals(avails, window),
+                                                  intersect_intervals(pending, window),
+                                                  intersect_intervals(approved, window))
+        if free or pending_nights or booked:
+            rows.append({'property_id': property_id, 'month': month_start,
+                         'booked_nights': booked, 'pending_nights': pending_nights, 'free_nights': free,
+                         'projected_revenue': booked * price, 'pending_revenue': pending_nights * price})
+    return rows
+
+
+def host_report(host_id, first_month, last_month):
+    """Host'un portföy toplamı, ev bazında ve ay bazında özetleri."""
+    columns = (func.coalesce(func.sum(PropertyMonthStats.booked_nights), 0),
+               func.coalesce(func.sum(PropertyMonthStats.pending_nights), 0),
+               func.coalesce(func.sum(PropertyMonthStats.free_nights), 0),
+               func.coalesce(func.sum(PropertyMonthStats.projected_revenue), 0),
+               func.coalesce(func.sum(PropertyMonthStats.pending_revenue), 0))
+    base = db.session.query().select_from(PropertyMonthStats) \
+        .join(Property, Property.id == PropertyMonthStats.property_id) \
+        .filter(Property.host_id == host_id, PropertyMonthStats.month.between(first_month, last_month))
+
+    totals = base.add_columns(*columns).one()
+    by_property = base.add_columns(Property.id, Property.title, *columns) \
+        .group_by(Property.id, Property.title).order_by(Property.id).all()
+    by_month = base.add_columns(PropertyMonthStats.month, *columns) \
+        .group_by(PropertyMonthStats.month).order_by(PropertyMonthStats.month).all()
+
+    return {
+        'totals': _summary(totals),
+        'properties': [dict(_summary(row[2:]), property_id=row[0], title=row[1]) for row in by_property],
+        'months': [dict(_summary(row[1:]), month=row[0].strftime('%Y-%m')) for row in by_month]
+    }
+
+
+def parse_month(value):
+    """YYYY-MM formatındaki metni ayın ilk gününe çevirir."""
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+def month_start(value):
+    return value.replace(day=1)
+
+
+def add_months(value, count):
+    index = value.year * 12 + value.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _summary(row):
+    booked, pending, free, revenue, pending_revenue = row
+    total = booked + pending + free
+    return {
+        'booked_nights': int(booked),
+        'pending_nights': int(pending),
+        'free_nights': int(free),
+        'occupancy': round(booked / float(total), 4) if total else 0.0,
+        'projected_revenue': float(revenue),
+        'pending_revenue': float(pending_revenue)
+    }
+
+
+def _months(intervals):
+    if not intervals:
+        return
+    current = month_start(min(start for start, _ in intervals))
+    last = max(end for _, end in intervals)
+    while current <= last:
+        following = add_months(current, 1)
+        yield current, following - timedelta(days=1)
+        current = following
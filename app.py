@@ -1,50 +1,150 @@
 # app.py
 
+import hashlib
 import os
 from datetime import datetime, date
 from dotenv import load_dotenv
 
 load_dotenv('.env')
 
-from flask import Flask, render_template, redirect, url_for, flash, request
+from flask import Flask, render_template, redirect, url_for, flash, request, jsonify, abort, Response, stream_with_context
 from config import Config
-from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, User, Property, Reservation, Availability
+from werkzeug.security import check_password_hash
+from models import db, User, Property, Reservation, Availability, PropertyMonthStats
 from forms import RegistrationForm, LoginForm, PropertyForm, AvailabilityForm
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
+from sqlalchemy.orm import joinedload, contains_eager
+import analytics
+import availability
+import booking
+import bulk
+import calendar_bitmap
+import database
+import geo
+import http_cache
+import identity
+import metrics
+import search
+import security
+import status_cache
+from changes import property_changed
+from jobs import queue
 
 app = Flask(__name__)
 app.config.from_object(Config)
 
 db.init_app(app)
 
+RESERVATION_STATUSES = ['pending', 'approved', 'rejected', 'canceled']
+
 login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+queue.init_app(app)
+security.login_limiter.limit = app.config['LOGIN_RATE_LIMIT']
+security.login_limiter.window = app.config['LOGIN_RATE_WINDOW']
+identity.ttl = app.config['USER_CACHE_TTL']
+identity.max_size = app.config['USER_CACHE_SIZE']
+
 with app.app_context():
-    db.create_all()
+    # Şema oluşturma başlangıç yolunda değil: `flask --app app init-db`
+    database.configure_engine(db.engine, app.config)
+    metrics.init_app(app, db.engine)
+
+@app.cli.command('init-db')
+def init_db_command():
+    # Tabloları oluşturur ve bekleyen migration'ları uygular
+    database.init_db()
+    print('Veritabanı şeması güncel.')
+
+@app.cli.command('rebuild-analytics')
+def rebuild_analytics_command():
+    # Aylık doluluk özetlerini tüm evler için baştan üretir (ilk kurulum veya onarım için)
+    property_ids = [pid for (pid,) in db.session.query(Property.id).order_by(Property.id)]
+    for property_id in property_ids:
+        analytics.refresh_property(property_id)
+    print('{} ev için özetler güncellendi.'.format(len(property_ids)))
+
+http_cache.page_cache.max_bytes = app.config['PAGE_CACHE_MAX_BYTES']
+
+if app.config['STATUS_CACHE_MIDNIGHT_REFRESH']:
+    @app.before_request
+    def start_midnight_refresh():
+        status_cache.ensure_midnight_refresh(app)
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return identity.load(int(user_id))
+
+def _index_query():
+    filters = {
+        'min_price': request.args.get('min_price', type=float),
+        'max_price': request.args.get('max_price', type=float),
+        'start_date': request.args.get('start_date', type=search.parse_date),
+        'end_date': request.args.get('end_date', type=search.parse_date)
+    }
+    return filters, search.filter_properties(Property.query, **filters)
+
+def _index_version():
+    # ETag sadece bu sayfada gösterilecek evlerin (id, updated_at) değerlerinden üretilir
+    _, query = _index_query()
+    return search.keyset_version(query, request.args.get('after', type=int), app.config['PROPERTIES_PER_PAGE'])
 
 @app.route('/')
+@http_cache.conditional_page(_index_version)
 def index():
-    properties = Property.query.all()
-    # Müsaitlik durumunu kontrol edelim
-    # Eğer geleceğe dönük en az bir Availability varsa ev müsait (green), yoksa unavailable (yellow).
-    for p in properties:
-        p.is_available = p.has_future_availability()
+    # Kartlar id üzerinden keyset sayfalama ile listelenir; harita marker'ları ise
+    # /api/map_markers üzerinden görünen alana göre yüklenir
+    filters, query = _index_query()
+    properties, next_cursor = search.keyset_page(query, request.args.get('after', type=int),
+                                                 app.config['PROPERTIES_PER_PAGE'])
 
     google_maps_api_key = app.config['GOOGLE_MAPS_API_KEY']
-    return render_template('index.html', properties=properties, google_maps_api_key=google_maps_api_key)
+    return render_template('index.html', properties=properties, filters=filters, next_cursor=next_cursor,
+                           google_maps_api_key=google_maps_api_key)
+
+@app.route('/api/search')
+def search_properties():
+    # Verilen tarih aralığında kiralanabilir evleri döndürür.
+    # Müsaitlik ve çakışma kontrolü indeksli SQL ile yapılır; sonuçlar fiyata göre sıralanabilir.
+    start_date = request.args.get('start_date', type=search.parse_date)
+    end_date = request.args.get('end_date', type=search.parse_date)
+    if not start_date or not end_date or start_date > end_date:
+        return jsonify(error='Geçerli bir start_date ve end_date (YYYY-MM-DD) gerekli.'), 400
+
+    query = search.filter_properties(Property.query,
+                                     min_price=request.args.get('min_price', type=float),
+                                     max_price=request.args.get('max_price', type=float),
+                                     start_date=start_date, end_date=end_date)
+    per_page = max(1, min(request.args.get('limit', app.config['PROPERTIES_PER_PAGE'], type=int), 100))
+    sort = request.args.get('sort', 'price')
+    cursor = request.args.get('after')
+    try:
+        if sort in ('price', '-price'):
+            properties, next_cursor = search.price_page(query, cursor, per_page, descending=(sort == '-price'))
+        else:
+            properties, next_cursor = search.keyset_page(query, int(cursor) if cursor else None, per_page)
+    except ValueError:
+        return jsonify(error='Geçersiz cursor.'), 400
+
+    return jsonify(next=next_cursor, results=[
+        {
+            'id': p.id,
+            'title': p.title,
+            'location': p.location,
+            'price': p.price,
+            'lat': p.latitude,
+            'lng': p.longitude,
+            'url': url_for('property_detail', property_id=p.id)
+        } for p in properties
+    ])
 
 @app.route('/register', methods=['GET', 'POST'])
 def register():
     form = RegistrationForm()
     if form.validate_on_submit():
-        hashed_password = generate_password_hash(form.password.data, method='pbkdf2:sha256')
+        hashed_password = security.hash_password(form.password.data)
         new_user = User(username=form.username.data, email=form.email.data,
                         password=hashed_password, role=form.role.data)
         db.session.add(new_user)
@@ -56,13 +156,25 @@ def register():
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     form = LoginForm()
+    if request.method == 'POST':
+        # Çok fazla hatalı deneme yapan IP veya email için parola doğrulamasına hiç girmiyoruz
+        limit_keys = [('ip', request.remote_addr), ('email', (request.form.get('email') or '').strip().lower())]
+        if any(security.login_limiter.is_limited(key) for key in limit_keys):
+            flash('Çok fazla hatalı giriş denemesi. Lütfen daha sonra tekrar deneyin.', 'danger')
+            return render_template('login.html', form=form), 429
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
         if user and check_password_hash(user.password, form.password.data):
+            # Hash eski algoritma/maliyetle üretilmişse şimdiki ayarlarla yeniden hesapla
+            if security.needs_rehash(user.password):
+                user.password = security.hash_password(form.password.data)
+                db.session.commit()
             login_user(user)
             flash('Giriş başarılı!', 'success')
             return redirect(url_for('index'))
         else:
+            for key in limit_keys:
+                security.login_limiter.hit(key)
             flash('Email veya şifre hatalı.', 'danger')
     return render_template('login.html', form=form)
 
@@ -75,10 +187,8 @@ def logout():
 
 @app.route('/add_property', methods=['GET', 'POST'])
 @login_required
+@security.role_required('host')
 def add_property():
-    if current_user.role != 'host':
-        flash('Bu sayfaya erişim izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     form = PropertyForm()
     if form.validate_on_submit():
         new_property = Property(
@@ -98,30 +208,28 @@ def add_property():
     return render_template('add_property.html', form=form, google_maps_api_key=google_maps_api_key)
 
 @app.route('/property/<int:property_id>')
+@http_cache.conditional_page(http_cache.property_version)
 def property_detail(property_id):
     property = Property.query.get_or_404(property_id)
     google_maps_api_key = app.config['GOOGLE_MAPS_API_KEY']
 
-    availabilities = [
-        {
-            'start': av.start_date.strftime('%Y-%m-%d'),
-            'end': av.end_date.strftime('%Y-%m-%d')
-        } for av in property.availabilities
-    ]
-
-    # Pending/approved rezervasyonları da alalım
-    reserved_ranges = [
-        {
-            'start': r.start_date.strftime('%Y-%m-%d'),
-            'end': r.end_date.strftime('%Y-%m-%d')
-        } for r in property.reservations if r.status in ['pending', 'approved']
-    ]
-
+    # Müsaitlik takvimi sayfaya gömülmez; sayfa /api/properties/<id>/calendar'dan bitmap olarak çeker
     return render_template('property_detail.html',
                            property=property,
-                           google_maps_api_key=google_maps_api_key,
-                           availabilities=availabilities,
-                           reserved_ranges=reserved_ranges)
+                           google_maps_api_key=google_maps_api_key)
+
+@app.route('/api/properties/<int:property_id>/calendar')
+def property_calendar(property_id):
+    # Kiralanabilir / pending / approved günleri gün başına bir bit olarak döndürür (bkz. calendar_bitmap).
+    # İçerik değişmedikçe aynı ETag döner; tarayıcı If-None-Match ile 304 alır.
+    if not db.session.query(Property.id).filter_by(id=property_id).first():
+        abort(404)
+    calendar = calendar_bitmap.build_calendar(property_id, app.config['CALENDAR_HORIZON_DAYS'])
+    response = jsonify(calendar)
+    response.set_etag(hashlib.sha1(response.get_data()).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['CALENDAR_MAX_AGE']
+    return response.make_conditional(request)
 
 @app.route('/book_property/<int:property_id>', methods=['POST'])
 @login_required
@@ -140,26 +248,23 @@ def book_property(property_id):
         flash('Tarih formatı hatalı.', 'danger')
         return redirect(url_for('property_detail', property_id=property_id))
 
-    # Seçilen tarihler müsait mi?
-    if not property.is_date_range_available(start_date, end_date):
+    # Müsaitlik kontrolü ve kayıt tek bir koşullu INSERT ile yapılır (bkz. booking.reserve);
+    # böylece eşzamanlı iki istek aynı tarihleri birlikte alamaz.
+    if not booking.reserve(property.id, current_user.id, start_date, end_date, on_reserved=property_changed):
         flash('Seçtiğiniz tarihlerde bu ev müsait değil.', 'danger')
         return redirect(url_for('property_detail', property_id=property_id))
 
-    # Müsait, rezervasyon oluştur
-    new_res = Reservation(property_id=property.id, user_id=current_user.id, date=datetime.now(), status='pending')
-    new_res.start_date = start_date
-    new_res.end_date = end_date
-    db.session.add(new_res)
-    db.session.commit()
     flash('Rezervasyon talebiniz oluşturuldu! Host onayından sonra kesinleşecektir.', 'success')
     return redirect(url_for('my_rentals'))
 
 @app.route('/my_rentals')
 @login_required
 def my_rentals():
-    # Kullanıcının yaptığı rezervasyonlar
-    reservations = Reservation.query.filter_by(user_id=current_user.id).all()
-    return render_template('my_rentals.html', reservations=reservations)
+    # Kullanıcının yaptığı rezervasyonlar; ev bilgisi aynı sorguda join ile gelir
+    query = Reservation.query.filter_by(user_id=current_user.id).options(joinedload(Reservation.property))
+    pagination = _reservation_page(query)
+    return render_template('my_rentals.html', reservations=pagination.items, pagination=pagination,
+                           statuses=RESERVATION_STATUSES)
 
 @app.route('/cancel_reservation/<int:reservation_id>', methods=['POST'])
 @login_required
@@ -170,25 +275,54 @@ def cancel_reservation(reservation_id):
         return redirect(url_for('my_rentals'))
     res.status = 'canceled'
     res.cancel_reason = 'Kullanıcı tarafından iptal edildi.'
+    property_changed(res.property_id)
     db.session.commit()
     flash('Rezervasyon başarıyla iptal edildi.', 'success')
     return redirect(url_for('my_rentals'))
 
 @app.route('/map')
+@http_cache.conditional_page(lambda: None)
 def map_view():
-    properties = Property.query.all()
-    # Her evin müsaitlik durumunu belirle
-    for p in properties:
-        p.is_available = p.has_future_availability()
+    # Marker'lar harita kaydırıldıkça /api/map_markers üzerinden yüklenir
     google_maps_api_key = app.config['GOOGLE_MAPS_API_KEY']
-    return render_template('map.html', properties=properties, google_maps_api_key=google_maps_api_key)
+    return render_template('map.html', google_maps_api_key=google_maps_api_key)
+
+@app.route('/api/map_markers')
+def map_markers():
+    # Görünen alan (bounding box) içindeki evleri döndürür; düşük zoom'da kümeler döner.
+    north = request.args.get('north', type=float)
+    south = request.args.get('south', type=float)
+    east = request.args.get('east', type=float)
+    west = request.args.get('west', type=float)
+    zoom = request.args.get('zoom', type=int)
+    if None in (north, south, east, west, zoom) or south > north:
+        return jsonify(error='north, south, east, west ve zoom parametreleri gerekli.'), 400
+    zoom = max(0, min(zoom, 22))
+
+    markers = None
+    if zoom >= app.config['MAP_CLUSTER_MAX_ZOOM']:
+        markers = geo.markers_in_bounds(south, west, north, east, app.config['MAP_MAX_MARKERS'])
+    if markers is None:
+        clusters = geo.clusters_in_bounds(south, west, north, east, zoom)
+        return jsonify(clusters=[{'count': count, 'lat': lat, 'lng': lng} for count, lat, lng in clusters],
+                       markers=[])
+
+    colors = status_cache.get_marker_colors([m.id for m in markers])
+    return jsonify(clusters=[], markers=[
+        {
+            'id': m.id,
+            'title': m.title,
+            'lat': m.latitude,
+            'lng': m.longitude,
+            'color': colors.get(m.id, 'red'),
+            'url': url_for('property_detail', property_id=m.id)
+        } for m in markers
+    ])
 
 @app.route('/manage_properties')
 @login_required
+@security.role_required('host')
 def manage_properties():
-    if current_user.role != 'host':
-        flash('Bu sayfaya erişim izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     # Host'un sahip olduğu evleri listeler
     properties = Property.query.filter_by(host_id=current_user.id).all()
     return render_template('manage_properties.html', properties=properties)
@@ -196,26 +330,20 @@ def manage_properties():
 
 @app.route('/delete_property/<int:property_id>', methods=['POST'])
 @login_required
+@security.role_required('host', message='Bu işleme izniniz yok.')
 def delete_property(property_id):
-    if current_user.role != 'host':
-        flash('Bu işleme izniniz yok.', 'danger')
-        return redirect(url_for('index'))
-
     property = Property.query.get_or_404(property_id)
     if property.host_id != current_user.id:
         flash('Bu evi silme yetkiniz yok.', 'danger')
         return redirect(url_for('manage_properties'))
 
-    # Rezervasyonları iptal et
-    # Bu evle ilgili tüm pending veya approved rezervasyonlar iptal ediliyor.
-    reservations = Reservation.query.filter_by(property_id=property.id).all()
-    for r in reservations:
-        if r.status in ['pending', 'approved']:
-            r.status = 'canceled'
-            r.cancel_reason = 'Ev sahibi evi sildiği için kiralama iptal edildi.'
-
-    # Ev veritabanından siliniyor
-    db.session.delete(property)
+    # Ev, müsaitlikleri ve rezervasyonları ORM nesneleri tek tek yüklenmeden, sabit sayıda
+    # DELETE ile siliniyor; önbellek yenilemesi commit'ten sonra arka plan kuyruğunda yapılır.
+    property_changed(property.id)
+    PropertyMonthStats.query.filter_by(property_id=property.id).delete(synchronize_session=False)
+    Availability.query.filter_by(property_id=property.id).delete(synchronize_session=False)
+    Reservation.query.filter_by(property_id=property.id).delete(synchronize_session=False)
+    Property.query.filter_by(id=property.id).delete(synchronize_session=False)
     db.session.commit()
 
     flash('Ev başarıyla silindi. İlgili rezervasyonlar da iptal edildi.', 'success')
@@ -223,10 +351,8 @@ def delete_property(property_id):
 
 @app.route('/manage_property_availability/<int:property_id>', methods=['GET', 'POST'])
 @login_required
+@security.role_required('host')
 def manage_property_availability(property_id):
-    if current_user.role != 'host':
-        flash('Bu sayfaya erişim izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     property = Property.query.get_or_404(property_id)
     if property.host_id != current_user.id:
         flash('Bu ev üzerinde işlem yapma yetkiniz yok.', 'danger')
@@ -234,24 +360,20 @@ def manage_property_availability(property_id):
 
     form = AvailabilityForm()
     if form.validate_on_submit():
-        # Mevcut tüm Availability kayıtlarını önce temizleyelim ya da güncelleyelim
-        # Burada basit yaklaşımla önce tüm kayıtları silip sonra yeni aralıklar ekliyoruz
-        # Gerçek senaryoda daha sofistike bir yaklaşım gerekebilir.
-        Availability.query.filter_by(property_id=property.id).delete()
-
-        # formdan gelecek format: start_date ve end_date birden fazla set olarak
-        # Örneğin kullanıcı birden fazla aralık seçmiş olabilir. Burada varsayıyoruz ki kullanıcı tek aralık giriyor.
-        # İsterseniz burada daha gelişmiş bir mantık kurabilirsiniz.
-        # Şimdilik tek bir aralık ekleyelim.
+        # Sadece seçilen aralık eklenir veya çıkarılır; diğer aralıklara dokunulmaz (bkz. availability.apply_changes)
         start_date = form.start_date.data
         end_date = form.end_date.data
         if start_date and end_date and start_date <= end_date:
-            new_av = Availability(property_id=property.id, start_date=start_date, end_date=end_date)
-            db.session.add(new_av)
-            db.session.commit()
+            if form.action.data == 'remove':
+                removed = availability.apply_changes(property.id, remove=[(start_date, end_date)])
+            else:
+                removed = availability.apply_changes(property.id, add=[(start_date, end_date)])
 
-            # Host tarihleri değiştirdiği için bu evin rezervasyonlarını kontrol edip iptal etmeliyiz
-            cancel_conflicting_reservations(property)
+            property_changed(property.id)
+            db.session.commit()
+            # Host tarihleri değiştirdiği için çıkarılan günlerle kesişen rezervasyonlar arka planda iptal edilir
+            if removed:
+                queue.enqueue(availability.cancel_conflicting_reservations, property.id, removed)
 
             flash('Müsaitlik aralıkları güncellendi.', 'success')
             return redirect(url_for('manage_properties'))
@@ -259,96 +381,227 @@ def manage_property_availability(property_id):
             flash('Geçersiz tarih aralığı.', 'danger')
 
     # Mevcut müsaitlikleri getir.
-    availabilities = property.availabilities
+    availabilities = Availability.query.filter_by(property_id=property.id).order_by(Availability.start_date).all()
     return render_template('manage_property_availability.html', property=property, form=form, availabilities=availabilities)
 
-def cancel_conflicting_reservations(property):
-    # Evdeki rezervasyonları al
-    # Yeni müsaitlik durumuna göre uygun olmayan rezervasyonları iptal et
-    # Burada basitçe: Evdeki tüm rezervasyonları inceleriz,
-    # eğer rezervasyonun tarih aralığı host'un yeni availability ayarına uymuyorsa iptal ederiz.
-    # Not: Burada aslında host'un verdiği availability aralıklarını bir union şeklinde değerlendirmek gerekebilir.
-    # Basitlik adına tek aralık üzerinden çalıştık. Gelişmiş versiyonda birden çok aralık tutulup
-    # rezervasyon tarihinin bu aralıklardan herhangi biri içinde kalıp kalmadığı incelenir.
-    # Şimdilik tek aralık varsayıyoruz.
-
-    # Evdeki müsaitlik aralıklarını alalım.
-    avails = property.availabilities
-
-    # Eğer hiç availability yoksa tüm rezervasyonlar iptal edilmeli.
-    if not avails:
-        res_list = Reservation.query.filter_by(property_id=property.id).filter(Reservation.status.in_(['pending', 'approved'])).all()
-        for r in res_list:
-            r.status = 'canceled'
-            r.cancel_reason = 'Host evin müsaitlik ayarlarını değiştirdiği için rezervasyon iptal edildi.'
+@app.route('/api/properties/<int:property_id>/availability', methods=['GET', 'PATCH'])
+@login_required
+@security.role_required('host', message='Bu ev üzerinde işlem yapma yetkiniz yok.', as_json=True)
+def property_availability_api(property_id):
+    # Birden fazla aralığı tek istekte ekleyip çıkarmak için JSON API.
+    # Gövde: {"add": [{"start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD"}], "remove": [...]}
+    property = Property.query.get_or_404(property_id)
+    if property.host_id != current_user.id:
+        return jsonify(error='Bu ev üzerinde işlem yapma yetkiniz yok.'), 403
+
+    conflict_check_queued = False
+    if request.method == 'PATCH':
+        payload = request.get_json(silent=True)
+        if payload is None:
+            payload = {}
+        if not isinstance(payload, dict):
+            return jsonify(error='İstek gövdesi bir JSON nesnesi olmalı.'), 400
+        try:
+            add = availability.parse_ranges(payload.get('add'), search.parse_date)
+            remove = availability.parse_ranges(payload.get('remove'), search.parse_date)
+        except (KeyError, TypeError, ValueError):
+            return jsonify(error='Geçersiz tarih aralığı.'), 400
+        removed = availability.apply_changes(property.id, add=add, remove=remove)
+        property_changed(property.id)
         db.session.commit()
-        return
-
-    # Şimdilik tek aralık varsayımı:
-    # Eğer birden fazla aralık varsa, rezervasyonun en az bir aralık içinde kalıp kalmadığına bakarız.
-    # Kolaylık için bu kodu da çoklu aralık destekleyecek hale getirelim.
-    def in_any_avail(res_start, res_end):
-        for av in avails:
-            # Eğer rezervasyonun tarihlerinin herhangi bir kısmı av.start_date - av.end_date arasında ise kabul ediyoruz.
-            # Kiralamada genelde tam overlapp bakılmalı:
-            if not (res_end < av.start_date or res_start > av.end_date):
-                return True
-        return False
-
-    res_list = Reservation.query.filter_by(property_id=property.id).filter(Reservation.status.in_(['pending', 'approved'])).all()
-    for r in res_list:
-        # Eğer rezervasyonun tarihleri yeni availability set'ine uymuyorsa iptal et
-        if not in_any_avail(r.start_date, r.end_date):
-            r.status = 'canceled'
-            r.cancel_reason = 'Kiralamak istediğiniz evin özellikleri değiştirildiği için kiralamanız iptal edildi.'
-    db.session.commit()
+        if removed:
+            conflict_check_queued = queue.enqueue(availability.cancel_conflicting_reservations, property.id, removed)
+
+    ranges = Availability.query.filter_by(property_id=property.id).order_by(Availability.start_date).all()
+    return jsonify(conflict_check_queued=conflict_check_queued, availabilities=[
+        {'start_date': av.start_date.isoformat(), 'end_date': av.end_date.isoformat()} for av in ranges
+    ])
 
 @app.route('/my_rentals_host')
 @login_required
+@security.role_required('host')
 def my_rentals_host():
-    if current_user.role != 'host':
-        flash('Bu sayfaya erişim izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     # Host'un evlerine yapılan rezervasyonları görmesi
     # Host onay/red işlemi burada yapılabilir.
-    properties = Property.query.filter_by(host_id=current_user.id).all()
-    # Tüm rezervasyonları çekelim:
-    all_res = []
-    for p in properties:
-        for r in p.reservations:
-            all_res.append(r)
-    return render_template('my_rentals_host.html', reservations=all_res)
+    # Ev ve kullanıcı bilgileri satır başına ayrı sorgu atılmasın diye tek sorguda join ile yüklenir.
+    query = Reservation.query.join(Reservation.property) \
+        .filter(Property.host_id == current_user.id) \
+        .options(contains_eager(Reservation.property), joinedload(Reservation.user))
+    pagination = _reservation_page(query)
+    return render_template('my_rentals_host.html', reservations=pagination.items, pagination=pagination,
+                           statuses=RESERVATION_STATUSES)
+
+def _reservation_page(query):
+    # ?status=pending gibi durum filtresi, ?order=asc|desc başlangıç tarihi sıralaması ve sayfalama
+    status = request.args.get('status')
+    if status in RESERVATION_STATUSES:
+        query = query.filter(Reservation.status == status)
+    if request.args.get('order') == 'desc':
+        query = query.order_by(Reservation.start_date.desc(), Reservation.id.desc())
+    else:
+        query = query.order_by(Reservation.start_date, Reservation.id)
+    return query.paginate(page=request.args.get('page', 1, type=int),
+                          per_page=app.config['RESERVATIONS_PER_PAGE'], error_out=False)
 
 @app.route('/approve_reservation/<int:reservation_id>', methods=['POST'])
 @login_required
+@security.role_required('host', message='Bu işleme izniniz yok.')
 def approve_reservation(reservation_id):
-    if current_user.role != 'host':
-        flash('Bu işleme izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     res = Reservation.query.get_or_404(reservation_id)
     # Bu rezervasyon ilgili hosta mı ait?
     if res.property.host_id != current_user.id:
         flash('Bu rezervasyonu onaylama yetkiniz yok.', 'danger')
         return redirect(url_for('my_rentals_host'))
-    res.status = 'approved'
+    # Onaylanan tarihlerle çakışan diğer bekleyen talepler de reddedilir
+    approved, _ = booking.approve_reservations([res])
+    if not approved:
+        flash('Sadece bekleyen rezervasyonlar onaylanabilir.', 'danger')
+        return redirect(url_for('my_rentals_host'))
+    property_changed(res.property_id)
     db.session.commit()
     flash('Rezervasyon onaylandı.', 'success')
     return redirect(url_for('my_rentals_host'))
 
 @app.route('/reject_reservation/<int:reservation_id>', methods=['POST'])
 @login_required
+@security.role_required('host', message='Bu işleme izniniz yok.')
 def reject_reservation(reservation_id):
-    if current_user.role != 'host':
-        flash('Bu işleme izniniz yok.', 'danger')
-        return redirect(url_for('index'))
     res = Reservation.query.get_or_404(reservation_id)
     if res.property.host_id != current_user.id:
         flash('Bu rezervasyonu reddetme yetkiniz yok.', 'danger')
         return redirect(url_for('my_rentals_host'))
     res.status = 'rejected'
+    property_changed(res.property_id)
     db.session.commit()
     flash('Rezervasyon reddedildi.', 'success')
     return redirect(url_for('my_rentals_host'))
 
+@app.route('/api/host/analytics')
+@login_required
+@security.role_required('host', as_json=True)
+def host_analytics():
+    # Host'un evleri için aylık doluluk ve gelir özetleri (?from=YYYY-MM&to=YYYY-MM).
+    # Veriler property_month_stats özet tablosundan okunur; rezervasyonlar taranmaz.
+    first_month = request.args.get('from', type=analytics.parse_month) or analytics.month_start(date.today())
+    last_month = request.args.get('to', type=analytics.parse_month) or analytics.add_months(first_month, 11)
+    report = analytics.host_report(current_user.id, first_month, last_month)
+    report['from'] = first_month.strftime('%Y-%m')
+    report['to'] = last_month.strftime('%Y-%m')
+    return jsonify(report)
+
+@app.route('/bulk_reservations', methods=['POST'])
+@login_required
+@security.role_required('host', message='Bu işleme izniniz yok.')
+def bulk_reservations():
+    # Seçilen rezervasyonları tek bir transaction içinde toplu onaylar veya reddeder.
+    action = request.form.get('action')
+    ids = request.form.getlist('reservation_ids', type=int)
+    if action not in ('approve', 'reject') or not ids:
+        flash('Lütfen rezervasyon ve işlem seçin.', 'danger')
+        return redirect(url_for('my_rentals_host'))
+
+    # Sadece bu host'un evlerine ait rezervasyonlar işlenir
+    reservations = Reservation.query.join(Reservation.property) \
+        .filter(Property.host_id == current_user.id, Reservation.id.in_(ids)) \
+        .options(contains_eager(Reservation.property)).all()
+    if action == 'approve':
+        approved, rejected = booking.approve_reservations(reservations)
+        message = '{} rezervasyon onaylandı, çakışan {} talep reddedildi.'.format(len(approved), rejected)
+    else:
+        rejected = booking.reject_reservations([r.id for r in reservations])
+        message = '{} rezervasyon reddedildi.'.format(rejected)
+    property_changed(*{r.property_id for r in reservations})
+    db.session.commit()
+    flash(message, 'success')
+    return redirect(url_for('my_rentals_host', **request.args))
+
+@metrics.register_collector
+def _cache_metrics():
+    status = status_cache.stats()
+    pages = http_cache.page_cache.stats()
+    jobs = queue.stats()
+    users = identity.stats()
+    return [
+        ('guestme_status_cache_hits_total', status['hits'], 'Marker rengi önbelleği isabetleri'),
+        ('guestme_status_cache_misses_total', status['misses'], 'Marker rengi önbelleği ıskaları'),
+        ('guestme_page_cache_hits_total', pages['hits'], 'Anonim sayfa önbelleği isabetleri'),
+        ('guestme_page_cache_misses_total', pages['misses'], 'Anonim sayfa önbelleği ıskaları'),
+        ('guestme_page_cache_bytes', pages['bytes'], 'Anonim sayfa önbelleğinin kullandığı bellek'),
+        ('guestme_user_cache_hits_total', users['hits'], 'Kullanıcı önbelleği isabetleri'),
+        ('guestme_user_cache_misses_total', users['misses'], 'Kullanıcı önbelleği ıskaları'),
+        ('guestme_job_queue_depth', jobs['depth'], 'Bekleyen ve çalışan arka plan işi sayısı'),
+        ('guestme_jobs_processed_total', jobs['processed'], 'Tamamlanan arka plan işleri'),
+        ('guestme_jobs_failed_total', jobs['failed'], 'Tüm denemeleri başarısız olan arka plan işleri'),
+        ('guestme_jobs_retried_total', jobs['retried'], 'Yeniden denenen arka plan işleri')
+    ]
+
+def _bulk_format(filename=None):
+    # ?format=csv|ndjson, yoksa dosya uzantısından tahmin edilir
+    fmt = request.args.get('format')
+    if not fmt and filename:
+        ext = filename.rsplit('.', 1)[-1].lower()
+        fmt = 'ndjson' if ext in ('ndjson', 'jsonl') else ext
+    return fmt or 'csv'
+
+def _bulk_import(import_func):
+    # Dosya multipart "file" alanında ya da doğrudan istek gövdesinde gönderilebilir
+    upload = request.files.get('file')
+    fmt = _bulk_format(upload.filename if upload else None)
+    if fmt not in bulk.FORMATS:
+        return jsonify(error='Desteklenmeyen format. csv veya ndjson kullanın.'), 400
+    stream = upload.stream if upload else request.stream
+    report = import_func(current_user.id, bulk.read_records(stream, fmt), app.config['BULK_BATCH_SIZE'])
+    return jsonify(report.as_dict())
+
+def _bulk_export(name, columns, rows):
+    fmt = _bulk_format()
+    if fmt not in bulk.FORMATS:
+        return jsonify(error='Desteklenmeyen format. csv veya ndjson kullanın.'), 400
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    body = stream_with_context(bulk.export_chunks(rows, columns, fmt))
+    return Response(body, mimetype=mimetype,
+                    headers={'Content-Disposition': 'attachment; filename={}.{}'.format(name, fmt)})
+
+@app.route('/api/host/import/properties', methods=['POST'])
+@login_required
+@security.role_required('host', message='Bu işleme izniniz yok.', as_json=True)
+def import_properties():
+    # Alanlar: title, description, location, price, latitude, longitude
+    return _bulk_import(bulk.import_properties)
+
+@app.route('/api/host/import/availability', methods=['POST'])
+@login_required
+@security.role_required('host', message='Bu işleme izniniz yok.', as_json=True)
+def import_availability():
+    # Alanlar: property_id, start_date, end_date (YYYY-MM-DD)
+    return _bulk_import(bulk.import_availability)
+
+@app.route('/api/host/export/properties')
+@login_required
+@security.role_required('host', as_json=True)
+def export_properties():
+    rows = bulk.property_rows(current_user.id, app.config['BULK_BATCH_SIZE'])
+    return _bulk_export('properties', bulk.PROPERTY_COLUMNS, rows)
+
+@app.route('/api/host/export/reservations')
+@login_required
+@security.role_required('host', as_json=True)
+def export_reservations():
+    rows = bulk.reservation_rows(current_user.id, app.config['BULK_BATCH_SIZE'])
+    return _bulk_export('reservations', bulk.RESERVATION_COLUMNS, rows)
+
+@app.route('/metrics')
+def metrics_view():
+    # Prometheus metin formatında istek, SQL ve önbellek metrikleri
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/status_cache_stats')
+def status_cache_stats():
+    # Anasayfanın ağır hesaplamayı yapıp yapmadığını izlemek için önbellek isabet sayaçları
+    return jsonify(status_cache.stats())
+
 if __name__ == '__main__':
+    # Geliştirme sunucusu için şemayı burada da güncel tutuyoruz
+    with app.app_context():
+        database.init_db()
     app.run(debug=True)
@@ -0,0 +1,99 @@
+# availability.py
+# Müsaitlik aralıklarının artımlı (diff tabanlı) güncellenmesi.
+# Veritabanında bir evin aralıkları her zaman birleştirilmiş (çakışmayan, bitişik olmayan) tutulur;
+# bir düzenleme sadece değişen satırları siler/ekler ve müsaitlikten çıkan günleri döndürür.
+from collections import defaultdict
+
+from sqlalchemy import and_, or_
+
+from changes import property_changed
+from intervals import merge_intervals, subtract_intervals
+from models import db, Availability, Reservation, chunked
+
+
+def apply_changes(property_id, add=(), remove=()):
+    """add aralıklarını ekleyip remove aralıklarını çıkarır; artık müsait olmayan günleri döndürür.
+
+    Commit çağıran tarafa bırakılır.
+    """
+    return apply_changes_many({property_id: (add, remove)})[property_id]
+
+
+def apply_changes_many(changes):
+    """{property_id: (add, remove)} değişikliklerini birden fazla ev için toplu uygular.
+
+    Her parça için mevcut satırlar tek sorguyla okunur, silinecekler tek DELETE, eklenecekler tek
+    executemany INSERT ile yazılır. {property_id: müsaitlikten çıkan aralıklar} döndürür; commit
+    çağıran tarafa bırakılır.
+    """
+    removed = {}
+    for chunk in chunked(changes):
+        rows = defaultdict(list)
+        for row in db.session.query(Availability.id, Availability.property_id,
+                                    Availability.start_date, Availability.end_date) \
+                .filter(Availability.property_id.in_(chunk)):
+            rows[row.property_id].append(row)
+
+        stale_ids = []
+        new_rows = []
+        for property_id in chunk:
+            add, remove = changes[property_id]
+            current = merge_intervals((r.start_date, r.end_date) for r in rows[property_id])
+            target = subtract_intervals(merge_intervals(current + list(add)), merge_intervals(remove))
+
+            # Hedef kümede aynen bulunan satırlar kalır, diğerleri silinir, eksik aralıklar eklenir
+            wanted = set(target)
+            kept = set()
+            for r in rows[property_id]:
+                key = (r.start_date, r.end_date)
+                if key in wanted and key not in kept:
+                    kept.add(key)
+                else:
+                    stale_ids.append(r.id)
+            new_rows.extend({'property_id': property_id, 'start_date': s, 'end_date': e}
+                            for s, e in target if (s, e) not in kept)
+            removed[property_id] = subtract_intervals(current, target)
+
+        for stale_chunk in chunked(stale_ids):
+            Availability.query.filter(Availability.id.in_(stale_chunk)).delete(synchronize_session=False)
+        if new_rows:
+            db.session.execute(Availability.__table__.insert(), new_rows)
+    return removed
+
+
+def overlapping_reservations(property_id, intervals):
+    """Verilen aralıklardan herhangi biriyle kesişen pending/approved rezervasyon sorgusu."""
+    overlap = or_(*[and_(Reservation.start_date <= end, Reservation.end_date >= start) for start, end in intervals])
+    return Reservation.query.filter(Reservation.property_id == property_id,
+                                    Reservation.status.in_(['pending', 'approved']),
+                                    overlap)
+
+
+def cancel_conflicting_reservations(property_id, removed_intervals):
+    """Müsaitlikten çıkarılan günlerle kesişen pending/approved rezervasyonları iptal eder.
+
+    Eklenen aralıklar hiçbir rezervasyonu geçersiz kılmadığı için tüm rezervasyonları taramaya gerek yok;
+    güncelleme tek bir UPDATE ile yapılır. Arka plan işi olarak çalışır ve tekrar çalıştırılması güvenlidir.
+    """
+    if not removed_intervals:
+        return 0
+    canceled = overlapping_reservations(property_id, removed_intervals).update({
+        'status': 'canceled',
+        'cancel_reason': 'Kiralamak istediğiniz evin özellikleri değiştirildiği için kiralamanız iptal edildi.'
+    }, synchronize_session=False)
+    if canceled:
+        property_changed(property_id)
+    db.session.commit()
+    return canceled
+
+
+def parse_ranges(items, parse_date):
+    """[{'start_date': ..., 'end_date': ...}] listesini (start, end) tuple'larına çevirir."""
+    ranges = []
+    for item in items or []:
+        start = parse_date(item['start_date'])
+        end = parse_date(item['end_date'])
+        if start > end:
+            raise ValueError('start_date end_date\'ten sonra olamaz')
+        ranges.append((start, end))
+    return ranges
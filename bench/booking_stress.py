@@ -0,0 +1,104 @@
+# bench/booking_stress.py
+# Eşzamanlı rezervasyon stres testi.
+# Yerel bir SQLite veritabanına çok sayıda thread ile çakışan rezervasyonlar gönderir,
+# sonunda hiçbir evde çift rezervasyon olmadığını doğrular ve saniyedeki işlem sayısını raporlar.
+#
+# Kullanım: python bench/booking_stress.py --threads 16 --bookings 400 --properties 5
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Eşzamanlı rezervasyon stres testi')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--bookings', type=int, default=400, help='toplam rezervasyon denemesi')
+    parser.add_argument('--properties', type=int, default=5)
+    parser.add_argument('--days', type=int, default=60, help='her evin müsait gün sayısı')
+    parser.add_argument('--database-url', help='varsayılan: geçici bir SQLite dosyası')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'stress.db')
+    os.environ.setdefault('SECRET_KEY', 'stress')
+    os.environ['STATUS_CACHE_MIDNIGHT_REFRESH'] = '0'
+    sys.path.insert(0, ROOT)
+
+    from app import app
+    from models import db, User, Property, Availability, Reservation
+    import booking
+    import database
+
+    today = date.today()
+    with app.app_context():
+        database.init_db()
+        host = User(username='stress_host', email='stress_host@example.com', password='-', role='host')
+        guest = User(username='stress_guest', email='stress_guest@example.com', password='-', role='user')
+        db.session.add_all([host, guest])
+        db.session.flush()
+        property_ids = []
+        for i in range(args.properties):
+            p = Property(host_id=host.id, title='Stres {}'.format(i), description='-', location='-',
+                         price=100, latitude=41.0, longitude=28.6)
+            db.session.add(p)
+            db.session.flush()
+            db.session.add(Availability(property_id=p.id, start_date=today,
+                                        end_date=today + timedelta(days=args.days - 1)))
+            property_ids.append(p.id)
+        db.session.commit()
+        guest_id = guest.id
+
+    jobs = []
+    for _ in range(args.bookings):
+        start = today + timedelta(days=random.randrange(args.days))
+        jobs.append((random.choice(property_ids), start, start + timedelta(days=random.randint(0, 4))))
+    chunks = [jobs[i::args.threads] for i in range(args.threads)]
+    counts = {'ok': 0, 'rejected': 0, 'error': 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(args.threads)
+
+    def worker(chunk):
+        barrier.wait()
+        for property_id, start, end in chunk:
+            with app.app_context():
+                try:
+                    outcome = 'ok' if booking.reserve(property_id, guest_id, start, end) else 'rejected'
+                except Exception:
+                    outcome = 'error'
+            with lock:
+                counts[outcome] += 1
+
+    threads = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    began = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    with app.app_context():
+        rows = db.session.query(Reservation.property_id, Reservation.start_date, Reservation.end_date) \
+            .filter(Reservation.status.in_(['pending', 'approved'])) \
+            .order_by(Reservation.property_id, Reservation.start_date).all()
+    double_bookings = 0
+    for prev, cur in zip(rows, rows[1:]):
+        if prev.property_id == cur.property_id and cur.start_date <= prev.end_date:
+            double_bookings += 1
+
+    print('denemeler      : {}'.format(args.bookings))
+    print('kabul          : {ok}\nreddedilen     : {rejected}\nhata           : {error}'.format(**counts))
+    print('süre           : {:.2f} sn'.format(elapsed))
+    print('throughput     : {:.1f} istek/sn'.format(args.bookings / elapsed))
+    print('çift rezervasyon: {}'.format(double_bookings))
+    if double_bookings:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
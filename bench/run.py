@@ -0,0 +1,152 @@
+# bench/run.py
+# Sıcak yolların benchmark'ı: model fonksiyonları ve Flask test client üzerinden route'lar.
+# Her ölçek için veritabanı sıfırdan doldurulur; her senaryo için gecikme yüzdelikleri
+# (p50/p95/p99) ve istek başına SQL ifadesi sayısı raporlanır. İsteğin kendi ifadeleri ile istekten sonra
+# arka plan kuyruğunda çalışan işlerin ifadeleri ayrı sayılır.
+#
+# Kullanım: python bench/run.py --scales 100,1000,10000 --iterations 50
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class QueryCounter:
+    """Ölçümü yapan thread'in ifadelerini ve arka plan işlerinin ifadelerini ayrı sayar."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.thread = threading.get_ident()
+        self.count = 0
+        self.job_count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.job_count = 0
+
+    def _count(self, *args, **kwargs):
+        with self._lock:
+            if threading.get_ident() == self.thread:
+                self.count += 1
+            else:
+                self.job_count += 1
+
+
+def measure(name, func, iterations, counter):
+    from jobs import queue
+
+    timings, queries, job_queries = [], [], []
+    for _ in range(iterations):
+        # Önceki ölçümden kalan işler bu ölçüme sayılmasın
+        queue.join()
+        counter.reset()
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+        queue.join()
+        queries.append(counter.count)
+        job_queries.append(counter.job_count)
+    print('  {:<34} p50 {:>8.2f} ms  p95 {:>8.2f} ms  p99 {:>8.2f} ms  sorgu {:>6.1f}  iş sorgusu {:>6.1f}'.format(
+        name, percentile(timings, 50), percentile(timings, 95), percentile(timings, 99),
+        sum(queries) / float(len(queries)), sum(job_queries) / float(len(job_queries))))
+
+
+def run_scale(app, scale, args, counter):
+    from models import db, Property, User
+    from seed import seed
+    import database
+    import http_cache
+
+    with app.app_context():
+        db.drop_all()
+        database.init_db()
+        started = time.perf_counter()
+        _, guest_ids = seed(max(10, scale // 10), scale, args.availability, args.reservations,
+                            rng=random.Random(scale))
+        print('\n== {} ev ({:.1f} sn veri üretimi) =='.format(scale, time.perf_counter() - started))
+        guest_email = db.session.get(User, guest_ids[0]).email
+        sample = [db.session.get(Property, pid) for pid in random.Random(1).sample(range(1, scale + 1), min(scale, 20))]
+
+        today = date.today()
+        measure('Property.get_marker_color', lambda: [p.get_marker_color() for p in sample], args.iterations, counter)
+        measure('Property.is_date_range_available',
+                lambda: [p.is_date_range_available(today + timedelta(days=10), today + timedelta(days=12))
+                         for p in sample], args.iterations, counter)
+        sample_ids = [p.id for p in sample]
+
+    client = app.test_client()
+    rng = random.Random(7)
+
+    def get(url):
+        def run():
+            if not args.warm_cache:
+                http_cache.page_cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return run
+
+    stay_start = today + timedelta(days=20)
+    measure('GET /', get('/'), args.iterations, counter)
+    measure('GET /map', get('/map'), args.iterations, counter)
+    measure('GET /property/<id>', lambda: get('/property/{}'.format(rng.choice(sample_ids)))(),
+            args.iterations, counter)
+    measure('GET /api/map_markers (zoom 14)',
+            get('/api/map_markers?north=41.05&south=41.0&east=28.95&west=28.85&zoom=14'), args.iterations, counter)
+    measure('GET /api/map_markers (zoom 9)',
+            get('/api/map_markers?north=41.3&south=40.8&east=29.4&west=28.4&zoom=9'), args.iterations, counter)
+    measure('GET /api/search',
+            get('/api/search?start_date={}&end_date={}'.format(stay_start, stay_start + timedelta(days=2))),
+            args.iterations, counter)
+
+    client.post('/login', data={'email': guest_email, 'password': 'benchmark'})
+
+    def book():
+        start = today + timedelta(days=rng.randint(0, 120))
+        client.post('/book_property/{}'.format(rng.choice(sample_ids)),
+                    data={'start_date': str(start), 'end_date': str(start + timedelta(days=2))})
+    measure('POST /book_property/<id>', book, args.iterations, counter)
+    client.get('/logout')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GuestMe sıcak yol benchmark\'ı')
+    parser.add_argument('--scales', default='100,1000,10000', help='virgülle ayrılmış ev sayıları (ör. 100,1000,100000)')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--availability', type=int, default=3, help='ev başına müsaitlik aralığı')
+    parser.add_argument('--reservations', type=int, default=5, help='ev başına rezervasyon')
+    parser.add_argument('--warm-cache', action='store_true', help='anonim sayfa önbelleğini ölçümler arasında temizleme')
+    parser.add_argument('--database-url', help='varsayılan: geçici bir SQLite dosyası')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ['STATUS_CACHE_MIDNIGHT_REFRESH'] = '0'
+    sys.path.insert(0, ROOT)
+    from app import app
+    from models import db
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+    for scale in [int(s) for s in args.scales.split(',')]:
+        run_scale(app, scale, args, counter)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# bench/seed.py
+# Benchmark'lar için sentetik veri üretici.
+# N kullanıcı, M ev (rastgele koordinatlar) ve her ev için K müsaitlik aralığı ile rezervasyon üretir;
+# satırlar toplu (executemany) INSERT'lerle yazılır.
+#
+# Kullanım: python bench/seed.py --users 1000 --properties 10000 --availability 3 --reservations 5
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# İstanbul civarı bir kutu; harita sorguları gerçekçi yoğunlukta olsun
+LAT_RANGE = (40.80, 41.30)
+LNG_RANGE = (28.40, 29.40)
+BATCH_SIZE = 5000
+
+
+def seed(users, properties, availability_per_property, reservations_per_property, rng=None):
+    """Aktif uygulama bağlamındaki veritabanına sentetik veri yazar; (host_ids, guest_ids) döndürür."""
+    from werkzeug.security import generate_password_hash
+    from models import db, User, Property, Availability, Reservation
+
+    rng = rng or random.Random(42)
+    today = date.today()
+    password = generate_password_hash('benchmark', method='pbkdf2:sha256')
+
+    hosts = max(1, users // 10)
+    _insert(db, User, ({'username': 'bench{}'.format(i), 'email': 'bench{}@example.com'.format(i),
+                        'password': password, 'role': 'host' if i < hosts else 'user'} for i in range(users)))
+    user_ids = [uid for (uid,) in db.session.query(User.id).order_by(User.id)]
+    host_ids, guest_ids = user_ids[:hosts], user_ids[hosts:] or user_ids
+
+    now = datetime.utcnow()
+    _insert(db, Property, ({'host_id': rng.choice(host_ids), 'title': 'Ev {}'.format(i),
+                            'description': 'Benchmark için üretilmiş ev açıklaması. ' * 3,
+                            'location': 'İstanbul', 'price': round(rng.uniform(300, 5000), 2),
+                            'latitude': rng.uniform(*LAT_RANGE), 'longitude': rng.uniform(*LNG_RANGE),
+                            'updated_at': now} for i in range(properties)))
+    property_ids = [pid for (pid,) in db.session.query(Property.id).order_by(Property.id)]
+
+    def availability_rows():
+        for pid in property_ids:
+            # Aralıklar sıralı ve aralarında boşluk olacak şekilde üretilir (depolama birleştirilmiş tutulur)
+            cursor = today - timedelta(days=rng.randint(0, 30))
+            for _ in range(availability_per_property):
+                start = cursor + timedelta(days=rng.randint(1, 10))
+                end = start + timedelta(days=rng.randint(7, 90))
+                cursor = end + timedelta(days=1)
+                yield {'property_id': pid, 'start_date': start, 'end_date': end}
+    _insert(db, Availability, availability_rows())
+
+    def reservation_rows():
+        for pid in property_ids:
+            cursor = today - timedelta(days=rng.randint(0, 30))
+            for _ in range(reservations_per_property):
+                start = cursor + timedelta(days=rng.randint(0, 15))
+                end = start + timedelta(days=rng.randint(1, 7))
+                cursor = end + timedelta(days=1)
+                yield {'property_id': pid, 'user_id': rng.choice(guest_ids), 'date': now,
+                       'status': rng.choice(['pending', 'approved', 'approved', 'rejected', 'canceled']),
+                       'start_date': start, 'end_date': end}
+    _insert(db, Reservation, reservation_rows())
+    return host_ids, guest_ids
+
+
+def _insert(db, model, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(model.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(model.__table__.insert(), batch)
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentetik benchmark verisi üretir')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--properties', type=int, default=1000)
+    parser.add_argument('--availability', type=int, default=3, help='ev başına müsaitlik aralığı')
+    parser.add_argument('--reservations', type=int, default=5, help='ev başına rezervasyon')
+    parser.add_argument('--database-url', help='varsayılan: DATABASE_URL ortam değişkeni')
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    os.environ['STATUS_CACHE_MIDNIGHT_REFRESH'] = '0'
+    sys.path.insert(0, ROOT)
+    from app import app
+    import database
+
+    with app.app_context():
+        database.init_db()
+        seed(args.users, args.properties, args.availability, args.reservations)
+    print('{} kullanıcı, {} ev yazıldı.'.format(args.users, args.properties))
+
+
+if __name__ == '__main__':
+    main()
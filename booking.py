@@ -0,0 +1,108 @@
+# booking.py
+# Rezervasyon oluşturma ve onay/red işlemleri. Müsaitlik kontrolü ve ekleme tek bir koşullu
+# INSERT ... SELECT ifadesiyle yapılır; böylece iki istek aynı geceleri kontrol edip ikisi birden ekleyemez.
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import and_, exists, insert, literal, or_, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from models import db, Property, Availability, Reservation
+
+
+def reserve(property_id, user_id, start_date, end_date, on_reserved=None, attempts=5):
+    """Tarihler müsaitse pending bir rezervasyon ekleyip commit eder ve True döndürür.
+
+    on_reserved verilirse commit'ten hemen önce property_id ile çağrılır (önbellek geçersizleme vb.).
+    """
+    if start_date > end_date:
+        return False
+
+    for attempt in range(attempts):
+        try:
+            if db.engine.dialect.name != 'sqlite':
+                # PostgreSQL/MySQL: aynı ev için eşzamanlı rezervasyonları ev satırı kilidiyle sıraya sok.
+                # SQLite'ta yazma ifadeleri zaten veritabanı kilidini alarak çalışır.
+                db.session.query(Property.id).filter_by(id=property_id).with_for_update().one()
+            result = db.session.execute(_conditional_insert(property_id, user_id, start_date, end_date))
+            if result.rowcount != 1:
+                db.session.rollback()
+                return False
+            if on_reserved:
+                on_reserved(property_id)
+            db.session.commit()
+            return True
+        except IntegrityError as e:
+            db.session.rollback()
+            if _is_overlap_violation(e):
+                # PostgreSQL'deki exclusion constraint çakışan bir rezervasyonu yakaladı
+                return False
+            raise
+        except OperationalError:
+            # SQLite "database is locked": kısa bir bekleme ile tekrar dene
+            db.session.rollback()
+            if attempt == attempts - 1:
+                raise
+            time.sleep(random.uniform(0.01, 0.05) * (attempt + 1))
+    return False
+
+
+def approve_reservations(reservations):
+    """Pending rezervasyonları onaylar ve onaylananlarla çakışan diğer pending talepleri reddeder.
+
+    Reddetme işlemi tek bir UPDATE ile yapılır. (onaylanan listesi, otomatik reddedilen sayısı) döndürür;
+    commit çağıran tarafa bırakılır.
+    """
+    approved = []
+    for r in sorted(reservations, key=lambda r: (r.property_id, r.start_date, r.id)):
+        if r.status != 'pending':
+            continue
+        # Aynı istekte daha önce onaylanan bir rezervasyonla çakışıyorsa aşağıdaki UPDATE onu reddeder
+        if any(a.property_id == r.property_id and a.start_date <= r.end_date and a.end_date >= r.start_date
+               for a in approved):
+            continue
+        r.status = 'approved'
+        approved.append(r)
+    if not approved:
+        return approved, 0
+
+    db.session.flush()
+    overlap = or_(*[and_(Reservation.property_id == a.property_id,
+                         Reservation.start_date <= a.end_date,
+                         Reservation.end_date >= a.start_date) for a in approved])
+    rejected = Reservation.query.filter(Reservation.status == 'pending', overlap).update({
+        'status': 'rejected',
+        'cancel_reason': 'Aynı tarihler için başka bir rezervasyon onaylandığı için talebiniz reddedildi.'
+    }, synchronize_session=False)
+    return approved, rejected
+
+
+def reject_reservations(reservation_ids):
+    """Verilen pending rezervasyonları tek bir UPDATE ile reddeder; commit çağıran tarafa bırakılır."""
+    if not reservation_ids:
+        return 0
+    return Reservation.query.filter(Reservation.id.in_(reservation_ids), Reservation.status == 'pending') \
+        .update({'status': 'rejected'}, synchronize_session=False)
+
+
+def _is_overlap_violation(error):
+    # 23P01 = exclusion_violation; sürücüye göre kod pgcode veya sqlstate'te bulunur
+    code = getattr(error.orig, 'pgcode', None) or getattr(error.orig, 'sqlstate', None)
+    return code == '23P01' or 'reservations_no_overlap' in str(error.orig)
+
+
+def _conditional_insert(property_id, user_id, start_date, end_date):
+    # Tek satırın kapsaması yeterli: müsaitlik satırları her zaman birleştirilmiş tutulur
+    # (bkz. availability.apply_changes_many ve 0005_merge_availability_rows migration'ı)
+    covered = exists().where(Availability.property_id == property_id,
+                             Availability.start_date <= start_date,
+                             Availability.end_date >= end_date)
+    blocked = exists().where(Reservation.property_id == property_id,
+                             Reservation.status.in_(['pending', 'approved']),
+                             Reservation.start_date <= end_date,
+                             Reservation.end_date >= start_date)
+    row = select(literal(property_id), literal(user_id), literal(datetime.now()), literal('pending'),
+                 literal(start_date), literal(end_date)).where(covered, ~blocked)
+    return insert(Reservation).from_select(
+        ['property_id', 'user_id', 'date', 'status', 'start_date', 'end_date'], row)
@@ -0,0 +1,197 @@
+# bulk.py
+# Ev ve müsaitlik verilerinin toplu içe aktarımı ile rezervasyon/ev listelerinin akışlı dışa aktarımı.
+# İçe aktarma dosyayı satır satır okur ve kayıtları sabit boyutlu gruplar halinde tek bir
+# executemany INSERT ile yazar; dışa aktarma sunucu taraflı cursor'dan gelen satırları parça parça
+# üretir. İki yönde de bellek kullanımı dosya boyutundan bağımsızdır.
+import csv
+import io
+import json
+from datetime import date, datetime
+from itertools import islice
+
+from sqlalchemy import select
+
+import availability
+from changes import property_changed
+from models import db, Property, Reservation, User, chunked
+from search import parse_date
+
+FORMATS = ('csv', 'ndjson')
+MAX_REPORTED_ERRORS = 100
+
+PROPERTY_COLUMNS = ['id', 'title', 'description', 'location', 'price', 'latitude', 'longitude', 'updated_at']
+RESERVATION_COLUMNS = ['id', 'property_id', 'property_title', 'user_id', 'username', 'date',
+                       'start_date', 'end_date', 'status', 'cancel_reason']
+
+
+def read_records(stream, fmt):
+    """İkili bir akıştan (satır_no, dict) çiftlerini üretir. Bozuk NDJSON satırları None olarak gelir."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        # Başlık satırı 1. satırdır, veriler 2'den başlar
+        for line_no, row in enumerate(csv.DictReader(text), start=2):
+            yield line_no, row
+    else:
+        for line_no, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else None
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, line_no, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line_no, 'error': message})
+
+    def as_dict(self):
+        return {'imported': self.imported, 'error_count': self.error_count, 'errors': self.errors}
+
+
+def import_properties(host_id, records, batch_size=1000):
+    """Evleri host_id adına ekler; her grup ayrı bir transaction'da yazılır."""
+    report = ImportReport()
+    for batch in _batches(records, batch_size):
+        rows = []
+        for line_no, record in batch:
+            try:
+                rows.append(_property_row(host_id, record))
+            except (KeyError, TypeError, ValueError) as e:
+                report.error(line_no, _message(e))
+        if rows:
+            db.session.execute(Property.__table__.insert(), rows)
+            db.session.commit()
+            report.imported += len(rows)
+    return report
+
+
+def import_availability(host_id, records, batch_size=1000):
+    """Müsaitlik aralıklarını ekler; sadece host_id'ye ait evler kabul edilir."""
+    report = ImportReport()
+    for batch in _batches(records, batch_size):
+        ranges = {}
+        for line_no, record in batch:
+            try:
+                property_id = int(record['property_id'])
+                start, end = parse_date(record['start_date']), parse_date(record['end_date'])
+                if start > end:
+                    raise ValueError('start_date end_date\'ten sonra olamaz')
+            except (KeyError, TypeError, ValueError) as e:
+                report.error(line_no, _message(e))
+                continue
+            ranges.setdefault(property_id, []).append((line_no, (start, end)))
+
+        owned = set()
+        for chunk in chunked(ranges):
+            owned.update(pid for (pid,) in db.session.query(Property.id)
+                         .filter(Property.id.in_(chunk), Property.host_id == host_id))
+        changes = {}
+        for property_id, items in ranges.items():
+            if property_id not in owned:
+                for line_no, _ in items:
+                    report.error(line_no, 'Bu ev üzerinde işlem yapma yetkiniz yok.')
+                continue
+            # Ekleme hiçbir rezervasyonu geçersiz kılmaz; sadece mevcut satırlarla birleştirilir
+            changes[property_id] = ([r for _, r in items], ())
+            report.imported += len(items)
+        if changes:
+            # Grup için tek okuma, tek DELETE ve tek executemany INSERT
+            availability.apply_changes_many(changes)
+            property_changed(*changes)
+        db.session.commit()
+    return report
+
+
+def property_rows(host_id, batch_size=1000):
+    stmt = select(*[getattr(Property, c) for c in PROPERTY_COLUMNS]) \
+        .where(Property.host_id == host_id).order_by(Property.id)
+    return _stream(stmt, batch_size)
+
+
+def reservation_rows(host_id, batch_size=1000):
+    stmt = select(Reservation.id, Reservation.property_id, Property.title, Reservation.user_id, User.username,
+                  Reservation.date, Reservation.start_date, Reservation.end_date, Reservation.status,
+                  Reservation.cancel_reason) \
+        .join(Property, Reservation.property_id == Property.id) \
+        .join(User, Reservation.user_id == User.id) \
+        .where(Property.host_id == host_id).order_by(Reservation.id)
+    return _stream(stmt, batch_size)
+
+
+def export_chunks(rows, columns, fmt, chunk_rows=500):
+    """Satırları CSV veya NDJSON metin parçaları halinde üretir (Response gövdesi olarak kullanılır)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(columns)
+    count = 0
+    for row in rows:
+        values = [_value(v) for v in row]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+            buffer.write('\n')
+        count += 1
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _stream(stmt, batch_size):
+    # yield_per sunucu taraflı cursor açar ve satırları batch_size'lık gruplar halinde çeker
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from partition
+
+
+def _property_row(host_id, record):
+    row = {'host_id': host_id}
+    for field in ('title', 'description', 'location'):
+        value = (record[field] or '').strip()
+        if not value:
+            raise ValueError('{} boş olamaz'.format(field))
+        row[field] = value
+    row['price'] = float(record['price'])
+    row['latitude'] = float(record['latitude'])
+    row['longitude'] = float(record['longitude'])
+    if row['price'] < 0:
+        raise ValueError('price negatif olamaz')
+    if not (-90 <= row['latitude'] <= 90 and -180 <= row['longitude'] <= 180):
+        raise ValueError('Geçersiz konum')
+    return row
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _message(error):
+    if isinstance(error, KeyError):
+        return 'Eksik alan: {}'.format(error.args[0])
+    if isinstance(error, TypeError):
+        return 'Geçersiz kayıt'
+    return str(error)
+
+
+def _value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
@@ -0,0 +1,44 @@
+# calendar_bitmap.py
+# Ev takvimini gün başına bir bit olacak şekilde sıkıştırır.
+# Bugünden itibaren belirli bir ufuk (horizon) için üç bitmap üretilir: kiralanabilir, pending ve approved.
+# Bit i, start + i gününü temsil eder (byte i // 8, bit i % 8). Bitmap'ler base64 ile kodlanır.
+import base64
+from datetime import date, timedelta
+
+from intervals import intersect_intervals, merge_intervals, subtract_intervals
+from models import db, Availability, Reservation
+
+
+def build_calendar(property_id, horizon_days, today=None):
+    today = today or date.today()
+    window = [(today, today + timedelta(days=horizon_days - 1))]
+
+    avails = db.session.query(Availability.start_date, Availability.end_date) \
+        .filter(Availability.property_id == property_id, Availability.end_date >= today)
+    reservations = db.session.query(Reservation.status, Reservation.start_date, Reservation.end_date) \
+        .filter(Reservation.property_id == property_id, Reservation.status.in_(['pending', 'approved']),
+                Reservation.end_date >= today)
+    pending, approved = [], []
+    for status, start, end in reservations:
+        (pending if status == 'pending' else approved).append((start, end))
+
+    pending = intersect_intervals(merge_intervals(pending), window)
+    approved = intersect_intervals(merge_intervals(approved), window)
+    available = subtract_intervals(intersect_intervals(merge_intervals(avails), window),
+                                   merge_intervals(pending + approved))
+
+    return {
+        'start': today.isoformat(),
+        'days': horizon_days,
+        'available': _encode(available, today, horizon_days),
+        'pending': _encode(pending, today, horizon_days),
+        'approved': _encode(approved, today, horizon_days)
+    }
+
+
+def _encode(intervals, start, days):
+    bits = bytearray((days + 7) // 8)
+    for first, last in intervals:
+        for i in range((first - start).days, (last - start).days + 1):
+            bits[i >> 3] |= 1 << (i & 7)
+    return base64.b64encode(bytes(bits)).decode('ascii')
@@ -0,0 +1,41 @@
+# changes.py
+# Bir evin müsaitlik/rezervasyon verisi değiştiğinde türetilmiş verileri güncel tutar.
+# property_changed() yazma yapan transaction'ın içinde çağrılır: marker önbelleğini siler ve evin
+# HTTP sürümünü (updated_at) ilerletir. Commit'ten sonra da marker önbelleği ve aylık doluluk özetleri
+# için yenileme işleri arka plan kuyruğuna verilir.
+from sqlalchemy import event
+
+import analytics
+import http_cache
+import status_cache
+from jobs import queue
+from models import db, chunked
+
+_SESSION_KEY = 'changed_properties'
+
+
+def property_changed(*property_ids):
+    """Çağıran tarafın commit'inden önce çağrılmalıdır."""
+    status_cache.invalidate(*property_ids)
+    http_cache.touch_properties(*property_ids)
+    db.session.info.setdefault(_SESSION_KEY, set()).update(property_ids)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _enqueue_refresh(session):
+    property_ids = sorted(session.info.pop(_SESSION_KEY, ()))
+    if len(property_ids) == 1:
+        # Tek evlik değişikliklerde aynı ev için bekleyen iş varsa yenisi eklenmez
+        property_id = property_ids[0]
+        queue.enqueue(status_cache.refresh, property_id, key=('status', property_id))
+        queue.enqueue(analytics.refresh_property, property_id, key=('analytics', property_id))
+        return
+    # Toplu değişikliklerde ev başına iş yerine parça başına tek iş
+    for chunk in chunked(property_ids):
+        queue.enqueue(status_cache.refresh, *chunk)
+        queue.enqueue(analytics.refresh_properties, chunk)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop(_SESSION_KEY, None)
@@ -1,8 +1,48 @@
 # config.py
 import os
 
+
+def _engine_options(database_url):
+    # SQLite'ta bağlantı havuzu ayarları anlamsız; busy_timeout ve WAL pragmaları database.py'de verilir
+    if not database_url or database_url.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1'
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_WAL = os.environ.get('SQLITE_WAL', '1') == '1'
     GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
+    # werkzeug biçiminde hash yöntemi, ör. "pbkdf2:sha256:600000" veya "scrypt:32768:8:1"
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+    # Pencere (saniye) içinde bu kadar hatalı denemeden sonra IP/email geçici olarak engellenir
+    LOGIN_RATE_LIMIT = int(os.environ.get('LOGIN_RATE_LIMIT', 10))
+    LOGIN_RATE_WINDOW = int(os.environ.get('LOGIN_RATE_WINDOW', 300))
+    # user_loader önbelleği: kayıt ömrü (saniye) ve en fazla kullanıcı sayısı
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 10000))
+    # Toplu içe/dışa aktarmada tek INSERT'e / tek cursor okumasına giren satır sayısı
+    BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+    PROPERTIES_PER_PAGE = int(os.environ.get('PROPERTIES_PER_PAGE', 24))
+    RESERVATIONS_PER_PAGE = int(os.environ.get('RESERVATIONS_PER_PAGE', 50))
+    CALENDAR_HORIZON_DAYS = int(os.environ.get('CALENDAR_HORIZON_DAYS', 365))
+    CALENDAR_MAX_AGE = int(os.environ.get('CALENDAR_MAX_AGE', 60))
+    MAP_CLUSTER_MAX_ZOOM = int(os.environ.get('MAP_CLUSTER_MAX_ZOOM', 11))
+    MAP_MAX_MARKERS = int(os.environ.get('MAP_MAX_MARKERS', 500))
+    PAGE_CACHE_MAX_BYTES = int(os.environ.get('PAGE_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    # 0 ise yavaş istek logu kapalıdır
+    SLOW_REQUEST_MS = int(os.environ.get('SLOW_REQUEST_MS', 0))
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_DELAY = float(os.environ.get('JOB_RETRY_DELAY', 0.5))
+    STATUS_CACHE_MIDNIGHT_REFRESH = os.environ.get('STATUS_CACHE_MIDNIGHT_REFRESH', '1') == '1'
@@ -0,0 +1,131 @@
+# database.py
+# Veritabanı bağlantı ayarları ve şema yönetimi.
+# Şema artık uygulama import edilirken değil, `flask --app app init-db` komutuyla oluşturulur.
+# Mevcut veritabanlarında eksik kolon ve indeksler sıralı, tekrar çalıştırılabilir migration'larla eklenir.
+import logging
+from datetime import datetime
+
+from sqlalchemy import bindparam, event, inspect, text
+
+import availability
+import geocell
+
+from models import db, Property, Reservation, Availability, User, chunked
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    id = db.Column(db.String(100), primary_key=True)
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+def configure_engine(engine, config):
+    """SQLite bağlantılarına WAL ve busy_timeout pragmalarını uygular."""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL modunda okuyucular yazıcıyı, yazıcı okuyucuları bloklamaz
+        if config['SQLITE_WAL']:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA busy_timeout={}'.format(int(config['SQLITE_BUSY_TIMEOUT_MS'])))
+        cursor.close()
+
+
+def init_db():
+    """Eksik tabloları oluşturur ve uygulanmamış migration'ları çalıştırır."""
+    db.create_all()
+    applied = {m.id for m in SchemaMigration.query.all()}
+    for migration_id, migrate in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        logger.info('Migration uygulanıyor: %s', migration_id)
+        migrate()
+        db.session.add(SchemaMigration(id=migration_id))
+        db.session.commit()
+
+
+def _add_property_updated_at():
+    columns = {c['name'] for c in inspect(db.engine).get_columns('properties')}
+    if 'updated_at' in columns:
+        return
+    db.session.execute(text('ALTER TABLE properties ADD COLUMN updated_at TIMESTAMP'))
+    db.session.execute(Property.__table__.update().values(updated_at=datetime.utcnow()))
+    db.session.commit()
+
+
+# 0002'nin sahip olduğu indeksler. Sonradan eklenen kolonların indeksleri (ör. geo_cell) kendi
+# migration'larında oluşturulur; burada olsalar kolon henüz yokken CREATE INDEX hata verirdi.
+_SECONDARY_INDEXES = ('ix_properties_host_id', 'ix_properties_price', 'ix_availability_property_dates',
+                      'ix_reservations_property_status', 'ix_reservations_user_id', 'ix_reservations_status')
+
+
+def _create_missing_indexes():
+    # Modellerde tanımlı olup eski veritabanlarında bulunmayan indeksler (checkfirst ile)
+    for model in (User, Property, Availability, Reservation):
+        for index in model.__table__.indexes:
+            if index.name in _SECONDARY_INDEXES:
+                index.create(db.engine, checkfirst=True)
+
+
+def _add_reservation_exclusion_constraint():
+    if db.engine.dialect.name != 'postgresql':
+        return
+    exists = db.session.execute(text(
+        "SELECT 1 FROM pg_constraint WHERE conname = 'reservations_no_overlap'")).first()
+    if exists:
+        return
+    db.session.execute(text('CREATE EXTENSION IF NOT EXISTS btree_gist'))
+    db.session.execute(text(
+        "ALTER TABLE reservations ADD CONSTRAINT reservations_no_overlap "
+        "EXCLUDE USING gist (property_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+        "WHERE (status IN ('pending', 'approved'))"))
+    db.session.commit()
+
+
+def _add_property_geo_cell():
+    columns = {c['name'] for c in inspect(db.engine).get_columns('properties')}
+    if 'geo_cell' not in columns:
+        db.session.execute(text('ALTER TABLE properties ADD COLUMN geo_cell BIGINT'))
+    # Mevcut evlerin hücre anahtarları parça parça doldurulur
+    update = Property.__table__.update().where(Property.id == bindparam('pid')).values(geo_cell=bindparam('cell'))
+    last_id = 0
+    while True:
+        rows = db.session.query(Property.id, Property.latitude, Property.longitude) \
+            .filter(Property.id > last_id).order_by(Property.id).limit(1000).all()
+        if not rows:
+            break
+        db.session.execute(update, [{'pid': pid, 'cell': geocell.cell_key(lat, lng)} for pid, lat, lng in rows])
+        last_id = rows[-1][0]
+    db.session.commit()
+    for index in Property.__table__.indexes:
+        if index.name == 'ix_properties_geo_cell':
+            index.create(db.engine, checkfirst=True)
+    # Yerini geo_cell indeksine bırakan eski (latitude, longitude) indeksi
+    if 'ix_properties_lat_lng' in {i['name'] for i in inspect(db.engine).get_indexes('properties')}:
+        db.session.execute(text('DROP INDEX ix_properties_lat_lng'))
+        db.session.commit()
+
+
+def _merge_availability_rows():
+    # Eski veritabanlarında bitişik/çakışan müsaitlik satırları olabilir. Takvim ve model birleştirilmiş
+    # aralıklara bakarken rezervasyon ve arama sorguları tek satırın kapsamasını arar; ikisi aynı sonucu
+    # versin diye depolama bir kez birleştirilmiş hale getirilir (sonraki yazmalar zaten birleştirir).
+    property_ids = [pid for (pid,) in db.session.query(Availability.property_id).distinct()]
+    for chunk in chunked(property_ids):
+        availability.apply_changes_many({pid: ((), ()) for pid in chunk})
+        db.session.commit()
+
+
+MIGRATIONS = [
+    ('0001_property_updated_at', _add_property_updated_at),
+    ('0002_secondary_indexes', _create_missing_indexes),
+    ('0003_reservation_exclusion_constraint', _add_reservation_exclusion_constraint),
+    ('0004_property_geo_cell', _add_property_geo_cell),
+    ('0005_merge_availability_rows', _merge_availability_rows),
+]
@@ -28,4 +28,5 @@ class PropertyForm(FlaskForm):
 class AvailabilityForm(FlaskForm):
     start_date = DateField('Başlangıç Tarihi', validators=[DataRequired()])
     end_date = DateField('Bitiş Tarihi', validators=[DataRequired()])
+    action = SelectField('İşlem', choices=[('add', 'Aralığı Müsait Yap'), ('remove', 'Aralığı Kapat')], default='add')
     submit = SubmitField('Müsaitlik Ayarla')
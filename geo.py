@@ -0,0 +1,44 @@
+# geo.py
+# Harita için bounding-box sorguları ve sunucu tarafı ızgara (grid) kümeleme.
+# Kutu, properties.geo_cell indeksinde birkaç anahtar aralığına çevrilir (bkz. geocell.py);
+# kümeleme de aynı kolonu kaba seviyeye kaydırıp gruplar. Böylece harita sadece görünen
+# alandaki evleri indeks üzerinden okur.
+from sqlalchemy import func, or_
+
+import geocell
+from models import db, Property
+
+
+def cell_level(zoom):
+    """Verilen zoom seviyesinde kümeleme hücresinin ızgara seviyesi."""
+    # 256px'lik bir karo 360 / 2^zoom derece; her karoyu 4x4 hücreye bölüyoruz (hücre 360 / 2^(zoom+2) derece)
+    return zoom + 2
+
+
+def in_bounds(query, south, west, north, east):
+    ranges = geocell.covering_ranges(south, west, north, east)
+    query = query.filter(or_(*[Property.geo_cell.between(low, high) for low, high in ranges]))
+    # Hücreler kutunun kenarlarından taşabilir; kesin sınırı koordinatlarla kontrol ediyoruz
+    query = query.filter(Property.latitude.between(south, north))
+    if west <= east:
+        return query.filter(Property.longitude.between(west, east))
+    # Görünen alan 180. meridyeni kesiyor
+    return query.filter(or_(Property.longitude >= west, Property.longitude <= east))
+
+
+def markers_in_bounds(south, west, north, east, limit):
+    """Alandaki evleri (id, title, latitude, longitude) olarak döndürür; limit aşılırsa None."""
+    query = in_bounds(db.session.query(Property.id, Property.title, Property.latitude, Property.longitude),
+                      south, west, north, east)
+    rows = query.order_by(Property.id).limit(limit + 1).all()
+    if len(rows) > limit:
+        return None
+    return rows
+
+
+def clusters_in_bounds(south, west, north, east, zoom):
+    """Alandaki evleri ızgara hücrelerine gruplayıp (count, latitude, longitude) döndürür."""
+    cell = Property.geo_cell.op('>>')(geocell.level_shift(cell_level(zoom))).label('cell')
+    query = db.session.query(func.count(Property.id), func.avg(Property.latitude), func.avg(Property.longitude))
+    query = in_bounds(query, south, west, north, east).group_by(cell)
+    return query.all()
@@ -0,0 +1,88 @@
+# geocell.py
+# Enlem/boylamı tek bir tamsayı ızgara hücresine (Z-order / geohash benzeri anahtar) çevirir.
+# Dünya GRID_BITS seviyeli bir dörtlü ağaca bölünür; her seviyede hücre kenarı (derece cinsinden)
+# yarıya iner. Anahtarın üst bitleri daha kaba seviyedeki hücreyi verdiği için bir hücrenin tüm alt
+# hücreleri ardışık bir anahtar aralığında durur: kutu sorguları birkaç indeks aralığına, kümeleme
+# ise anahtarı sağa kaydırıp gruplamaya dönüşür.
+# İki eksen de aynı ölçekle (360 derece) kodlanır; böylece hücreler derece cinsinden karedir.
+GRID_BITS = 16
+MAX_RANGES = 64
+
+_SIDE = 1 << GRID_BITS
+
+
+def cell_key(latitude, longitude):
+    """Bir noktanın en ince seviyedeki hücre anahtarı."""
+    return _interleave(*_grid_xy(float(latitude), float(longitude), GRID_BITS))
+
+
+def level_shift(level):
+    """Anahtarı verilen seviyedeki hücreye indirmek için sağa kaydırılacak bit sayısı."""
+    return 2 * (GRID_BITS - min(max(level, 0), GRID_BITS))
+
+
+def covering_ranges(south, west, north, east, max_ranges=MAX_RANGES):
+    """Kutuyu kaplayan hücre anahtarı aralıklarını [(düşük, yüksek)] olarak döndürür.
+
+    Aralıklar kutudan biraz geniş olabilir; kesin sınır kontrolü çağıran tarafa aittir.
+    """
+    if west > east:
+        # 180. meridyeni kesen kutu iki parçaya bölünür
+        boxes = [(south, west, north, 180.0), (south, -180.0, north, east)]
+    else:
+        boxes = [(south, west, north, east)]
+
+    level = GRID_BITS
+    while level > 0:
+        cells = sum(_cell_count(box, level) for box in boxes)
+        if cells <= max_ranges:
+            break
+        level -= 1
+
+    shift = level_shift(level)
+    codes = sorted({_interleave(x, y) for box in boxes for x, y in _cells(box, level)})
+    ranges = []
+    for code in codes:
+        low, high = code << shift, ((code + 1) << shift) - 1
+        if ranges and ranges[-1][1] + 1 == low:
+            ranges[-1] = (ranges[-1][0], high)
+        else:
+            ranges.append((low, high))
+    return ranges
+
+
+def _grid_xy(latitude, longitude, level):
+    side = 1 << level
+    x = int((longitude + 180.0) / 360.0 * side)
+    y = int((latitude + 90.0) / 360.0 * side)
+    return min(max(x, 0), side - 1), min(max(y, 0), side - 1)
+
+
+def _cell_count(box, level):
+    south, west, north, east = box
+    x0, y0 = _grid_xy(south, west, level)
+    x1, y1 = _grid_xy(north, east, level)
+    return (x1 - x0 + 1) * (y1 - y0 + 1)
+
+
+def _cells(box, level):
+    south, west, north, east = box
+    x0, y0 = _grid_xy(south, west, level)
+    x1, y1 = _grid_xy(north, east, level)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+
+def _interleave(x, y):
+    # x çift, y tek bitlere yerleşir (Morton kodu)
+    return _spread(x) | (_spread(y) << 1)
+
+
+def _spread(value):
+    value &= 0xFFFF
+    value = (value | (value << 8)) & 0x00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F
+    value = (value | (value << 2)) & 0x33333333
+    value = (value | (value << 1)) & 0x55555555
+    return value
@@ -0,0 +1,111 @@
+# http_cache.py
+# Herkese açık sayfalar için koşullu GET (ETag / 304) ve anonim kullanıcılar için
+# render edilmiş HTML önbelleği. ETag, sayfanın dayandığı verinin sürümünden
+# (properties.updated_at) türetilir; veri değişmedikçe sayfa yeniden render edilmez.
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+from models import db, Property, chunked
+
+
+class LRUCache:
+    """Toplam bayt sınırı olan, thread-safe LRU önbellek."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._items[key] = value
+            self._size += len(value)
+            # En uzun süredir kullanılmayan kayıtlardan başlayarak sınırın altına in
+            while self._size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._items), 'bytes': self._size, 'hits': self.hits, 'misses': self.misses}
+
+
+page_cache = LRUCache(max_bytes=16 * 1024 * 1024)
+
+
+def property_version(property_id):
+    return db.session.query(Property.updated_at).filter_by(id=property_id).scalar()
+
+
+def touch_properties(*property_ids):
+    """Evlerin updated_at damgasını günceller; böylece bu evlere bağlı ETag'ler değişir."""
+    now = datetime.utcnow()
+    for chunk in chunked(property_ids):
+        Property.query.filter(Property.id.in_(chunk)) \
+            .update({'updated_at': now}, synchronize_session=False)
+
+
+def conditional_page(version_func):
+    """Sayfayı version_func'ın döndürdüğü veri sürümüne göre ETag'ler ve önbellekler.
+
+    version_func route ile aynı argümanları alır. Anonim kullanıcıların 200 yanıtları
+    render edilmiş haliyle page_cache'e konur; giriş yapmış kullanıcılar sadece 304'ten yararlanır.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Bekleyen flash mesajı varsa sayfa kullanıcıya özeldir; önbelleği atla
+            if session.get('_flashes'):
+                return view(*args, **kwargs)
+
+            anonymous = not current_user.is_authenticated
+            identity = 'anon' if anonymous else current_user.get_id()
+            key = repr((request.full_path, identity, date.today(), version_func(*args, **kwargs)))
+            etag = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+            if etag in request.if_none_match:
+                response = current_app.response_class(status=304)
+            else:
+                body = page_cache.get(etag) if anonymous else None
+                if body is not None:
+                    response = make_response(body)
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if anonymous and response.status_code == 200:
+                        page_cache.set(etag, response.get_data())
+            response.set_etag(etag)
+            # Tarayıcı her seferinde If-None-Match ile doğrulasın
+            response.cache_control.no_cache = True
+            response.vary.add('Cookie')
+            return response
+        return wrapper
+    return decorator
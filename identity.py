@@ -0,0 +1,75 @@
+# identity.py
+# Flask-Login user_loader için süre sınırlı kullanıcı önbelleği.
+# Her kimliği doğrulanmış istekte users tablosuna gidilmesin diye kullanıcının kolon değerleri
+# oturumdan bağımsız (detached) bir kopya olarak saklanır; istekte session.merge(load=False) ile
+# SQL çalıştırmadan oturuma eklenir. Kullanıcı güncellenince/silinince kayıt önbellekten düşer,
+# çok süreçli kurulumlarda da en fazla TTL kadar eski kalabilir.
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from models import db, User
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+ttl = 60
+max_size = 10000
+
+
+def load(user_id):
+    """Kullanıcıyı önbellekten, yoksa veritabanından yükler."""
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            _entries.move_to_end(user_id)
+            _stats['hits'] += 1
+            cached = entry[1]
+        else:
+            _stats['misses'] += 1
+            cached = None
+    if cached is not None:
+        # merge önbellekteki nesneyi değiştirmez; oturuma ait yeni bir kopya döndürür
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        _store(user, now)
+    return user
+
+
+def invalidate(*user_ids):
+    with _lock:
+        for user_id in user_ids:
+            _entries.pop(user_id, None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def stats():
+    with _lock:
+        return dict(_stats, size=len(_entries))
+
+
+def _store(user, now):
+    snapshot = User(**{attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+    make_transient_to_detached(snapshot)
+    with _lock:
+        _entries[user.id] = (now + ttl, snapshot)
+        _entries.move_to_end(user.id)
+        while len(_entries) > max_size:
+            _entries.popitem(last=False)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _user_changed(mapper, connection, target):
+    invalidate(target.id)
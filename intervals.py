@@ -0,0 +1,99 @@
+# intervals.py
+# Tarih aralıkları üzerinde küme işlemleri.
+# Aralıklar (start, end) şeklinde tuple'lardır ve her iki uç da dahildir (gün bazında).
+# Fonksiyonlar sıralı, birleştirilmiş aralık listeleri üzerinde uç noktaları tarayarak çalışır;
+# böylece gün gün yürümek yerine O(n log n) maliyetle hesap yapılır.
+from bisect import bisect_right
+from datetime import date, timedelta
+
+ONE_DAY = timedelta(days=1)
+
+
+def merge_intervals(intervals):
+    """Çakışan veya bitişik aralıkları birleştirip sıralı bir liste döndürür."""
+    valid = sorted((s, e) for s, e in intervals if s is not None and e is not None and s <= e)
+    merged = []
+    for start, end in valid:
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(base, remove):
+    """base aralıklarından remove aralıklarını çıkarır. İki liste de birleştirilmiş olmalıdır."""
+    result = []
+    j = 0
+    for start, end in base:
+        current = start
+        # base sıralı olduğu için remove üzerindeki imleç geri gitmez
+        while j < len(remove) and remove[j][1] < current:
+            j += 1
+        k = j
+        while k < len(remove) and remove[k][0] <= end:
+            r_start, r_end = remove[k]
+            if r_start > current:
+                result.append((current, r_start - ONE_DAY))
+            if r_end >= end:
+                current = None
+                break
+            current = max(current, r_end + ONE_DAY)
+            k += 1
+        if current is not None and current <= end:
+            result.append((current, end))
+    return result
+
+
+def intersect_intervals(a, b):
+    """İki birleştirilmiş aralık listesinin kesişimini döndürür."""
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start <= end:
+            result.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def total_days(intervals):
+    """Birleştirilmiş aralıkların kapsadığı toplam gün sayısı."""
+    return sum((end - start).days + 1 for start, end in intervals)
+
+
+def covers(intervals, start, end):
+    """[start, end] aralığı birleştirilmiş listedeki tek bir aralığın içinde mi?"""
+    if start > end:
+        return False
+    # start'tan sonra başlamayan son aralık, end'i de kapsıyorsa aralık tamamen içeridedir
+    idx = bisect_right(intervals, (start, date.max))
+    return idx > 0 and intervals[idx - 1][1] >= end
+
+
+def overlaps(intervals, start, end):
+    """[start, end] aralığı birleştirilmiş listedeki herhangi bir aralıkla kesişiyor mu?"""
+    idx = bisect_right(intervals, (end, date.max))
+    # end'den sonra başlamayan son aralık, start'a ulaşıyorsa kesişim vardır
+    return idx > 0 and intervals[idx - 1][1] >= start
+
+
+def day_counts(availability, pending, approved):
+    """Müsaitlik günlerini serbest / pending / approved olarak sayar.
+
+    Hem pending hem approved rezervasyonla kaplı günler eski davranışta olduğu gibi pending sayılır.
+    """
+    availability = merge_intervals(availability)
+    pending = merge_intervals(pending)
+    approved = merge_intervals(approved)
+    blocked = merge_intervals(pending + approved)
+
+    free_days = total_days(subtract_intervals(availability, blocked))
+    pending_days = total_days(intersect_intervals(availability, pending))
+    approved_days = total_days(subtract_intervals(intersect_intervals(availability, approved), pending))
+    return free_days, pending_days, approved_days
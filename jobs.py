@@ -0,0 +1,94 @@
+# jobs.py
+# Süreç içi arka plan iş kuyruğu (thread havuzu).
+# Rezervasyon iptali gibi zincirleme güncellemeler ve önbellek yenilemeleri istek yolundan çıkarılıp
+# burada çalıştırılır. Aynı anahtarla kuyrukta bekleyen bir iş varsa ikincisi eklenmez (idempotent);
+# hata veren işler artan beklemeyle yeniden denenir.
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    def __init__(self, workers=2, max_attempts=3, retry_delay=0.5):
+        self.app = None
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._executor = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queued_keys = set()
+        self._stats = {'queued': 0, 'running': 0, 'processed': 0, 'failed': 0, 'retried': 0}
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config['JOB_WORKERS']
+        self.max_attempts = app.config['JOB_MAX_ATTEMPTS']
+        self.retry_delay = app.config['JOB_RETRY_DELAY']
+
+    def enqueue(self, func, *args, key=None, **kwargs):
+        """İşi kuyruğa ekler. key ile aynı iş zaten bekliyorsa eklemez ve False döndürür."""
+        with self._lock:
+            if key is not None:
+                if key in self._queued_keys:
+                    return False
+                self._queued_keys.add(key)
+            self._stats['queued'] += 1
+            if self._executor is None:
+                # Thread'ler ilk işte başlatılır; böylece gunicorn fork'undan önce thread oluşmaz
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='guestme-job')
+        self._executor.submit(self._run, func, args, kwargs, key)
+        return True
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['depth'] = stats['queued'] + stats['running']
+        return stats
+
+    def join(self, timeout=None):
+        """Kuyruk boşalana kadar bekler (CLI, benchmark ve testler için)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._stats['queued'] or self._stats['running']:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def _run(self, func, args, kwargs, key):
+        with self._lock:
+            # Çalışmaya başlayan iş artık "bekleyen" sayılmaz; bu sırada gelen aynı anahtarlı iş tekrar kuyruğa girer
+            self._queued_keys.discard(key)
+            self._stats['queued'] -= 1
+            self._stats['running'] += 1
+        outcome = 'failed'
+        try:
+            with self.app.app_context():
+                for attempt in range(1, self.max_attempts + 1):
+                    try:
+                        func(*args, **kwargs)
+                        outcome = 'processed'
+                        break
+                    except Exception:
+                        db.session.rollback()
+                        if attempt == self.max_attempts:
+                            logger.exception('Arka plan işi başarısız oldu: %s', getattr(func, '__name__', func))
+                            break
+                        with self._lock:
+                            self._stats['retried'] += 1
+                        time.sleep(self.retry_delay * 2 ** (attempt - 1))
+        finally:
+            with self._idle:
+                self._stats['running'] -= 1
+                self._stats[outcome] += 1
+                self._idle.notify_all()
+
+
+queue = JobQueue()
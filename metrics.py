@@ -0,0 +1,160 @@
+# metrics.py
+# İstek bazlı performans ölçümü: SQL ifade sayısı ve süresi (SQLAlchemy event'leri),
+# şablon render süresi (Flask sinyalleri) ve endpoint başına gecikme histogramları.
+# Veriler /metrics üzerinden Prometheus metin formatında sunulur; eşiği aşan istekler
+# çalıştırdıkları sorgularla birlikte loglanır.
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+logger = logging.getLogger('guestme.slow_requests')
+
+# Yavaş istek logunda tutulacak en fazla sorgu sayısı
+MAX_LOGGED_QUERIES = 200
+
+# Saniye cinsinden histogram kova sınırları
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_latency = defaultdict(lambda: [0] * (len(BUCKETS) + 1))   # endpoint -> kova sayaçları (+Inf dahil)
+_totals = defaultdict(lambda: {'count': 0, 'seconds': 0.0, 'sql_count': 0, 'sql_seconds': 0.0,
+                               'render_seconds': 0.0})
+_collectors = []
+
+
+def init_app(app, engine):
+    """İstek hook'larını, sinyalleri ve SQLAlchemy event'lerini bağlar."""
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_start_render, app)
+    template_rendered.connect(_finish_render, app)
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
+
+
+def register_collector(func):
+    """/metrics çıktısına eklenecek (isim, değer, açıklama) üçlülerini döndüren bir fonksiyon kaydeder.
+
+    İsmi _total ile biten metrikler counter, diğerleri gauge olarak yazılır.
+    """
+    _collectors.append(func)
+    return func
+
+
+def current():
+    """Mevcut isteğin ölçümleri (istek dışında None)."""
+    if has_request_context():
+        return g.get('_metrics')
+    return None
+
+
+def render_prometheus():
+    lines = []
+    with _lock:
+        latency = {k: list(v) for k, v in _latency.items()}
+        totals = {k: dict(v) for k, v in _totals.items()}
+
+    lines.append('# HELP guestme_request_duration_seconds Endpoint başına istek süresi')
+    lines.append('# TYPE guestme_request_duration_seconds histogram')
+    for endpoint in sorted(latency):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), latency[endpoint]):
+            cumulative += count
+            lines.append('guestme_request_duration_seconds_bucket{{endpoint="{}",le="{}"}} {}'
+                         .format(endpoint, bound, cumulative))
+        lines.append('guestme_request_duration_seconds_sum{{endpoint="{}"}} {:.6f}'
+                     .format(endpoint, totals[endpoint]['seconds']))
+        lines.append('guestme_request_duration_seconds_count{{endpoint="{}"}} {}'
+                     .format(endpoint, totals[endpoint]['count']))
+
+    for name, key, help_text in (
+            ('guestme_sql_statements_total', 'sql_count', 'Endpoint başına çalıştırılan SQL ifadesi sayısı'),
+            ('guestme_sql_seconds_total', 'sql_seconds', 'Endpoint başına toplam SQL süresi'),
+            ('guestme_template_render_seconds_total', 'render_seconds', 'Endpoint başına şablon render süresi')):
+        lines.append('# HELP {} {}'.format(name, help_text))
+        lines.append('# TYPE {} counter'.format(name))
+        for endpoint in sorted(totals):
+            lines.append('{}{{endpoint="{}"}} {}'.format(name, endpoint, round(totals[endpoint][key], 6)))
+
+    for collector in _collectors:
+        for name, value, help_text in collector():
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} {}'.format(name, 'counter' if name.endswith('_total') else 'gauge'))
+            lines.append('{} {}'.format(name, value))
+    return '\n'.join(lines) + '\n'
+
+
+def _start_request():
+    g._metrics = {'start': time.perf_counter(), 'sql_count': 0, 'sql_seconds': 0.0,
+                  'render_seconds': 0.0, 'queries': [], 'render_start': []}
+
+
+def _finish_request(response):
+    data = g.pop('_metrics', None)
+    if data is None:
+        return response
+    elapsed = time.perf_counter() - data['start']
+    endpoint = request.endpoint or 'unknown'
+
+    with _lock:
+        buckets = _latency[endpoint]
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                buckets[i] += 1
+                break
+        else:
+            buckets[-1] += 1
+        totals = _totals[endpoint]
+        totals['count'] += 1
+        totals['seconds'] += elapsed
+        totals['sql_count'] += data['sql_count']
+        totals['sql_seconds'] += data['sql_seconds']
+        totals['render_seconds'] += data['render_seconds']
+
+    threshold = current_app.config.get('SLOW_REQUEST_MS')
+    if threshold and elapsed * 1000 >= threshold:
+        logger.warning('Yavaş istek %s %s: %.1f ms, %d SQL (%.1f ms), render %.1f ms\n%s',
+                       request.method, request.full_path, elapsed * 1000, data['sql_count'],
+                       data['sql_seconds'] * 1000, data['render_seconds'] * 1000,
+                       '\n'.join('  {:.1f} ms  {}'.format(ms, sql) for ms, sql in data['queries']))
+    return response
+
+
+def _start_render(sender, template, context, **extra):
+    data = current()
+    if data is not None:
+        data['render_start'].append(time.perf_counter())
+
+
+def _finish_render(sender, template, context, **extra):
+    data = current()
+    if data is not None and data['render_start']:
+        data['render_seconds'] += time.perf_counter() - data['render_start'].pop()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrics_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['_metrics_start'].pop()
+    data = current()
+    if data is None:
+        return
+    duration = time.perf_counter() - started
+    data['sql_count'] += 1
+    data['sql_seconds'] += duration
+    if len(data['queries']) < MAX_LOGGED_QUERIES:
+        data['queries'].append((duration * 1000, ' '.join(statement.split())))
+
+
+def _handle_error(exception_context):
+    # Hata veren ifadede after_cursor_execute çalışmaz; başlangıç zamanını yığından at
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('_metrics_start'):
+        conn.info['_metrics_start'].pop()
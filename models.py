@@ -1,10 +1,24 @@
 # models.py
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from datetime import date, timedelta
+from sqlalchemy import event, DDL
+from collections import defaultdict
+from datetime import date, datetime
+from geocell import cell_key
+from intervals import merge_intervals, covers, overlaps, day_counts
 
 db = SQLAlchemy()
 
+# Çok uzun IN (...) listeleri veritabanı parametre limitine takılmasın diye sorgular bu boyutta parçalara bölünür
+IN_CHUNK_SIZE = 500
+
+
+def chunked(values, size=IN_CHUNK_SIZE):
+    """Değerleri en fazla size elemanlı listeler halinde üretir."""
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
 class User(db.Model, UserMixin):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -15,16 +29,29 @@ class User(db.Model, UserMixin):
 
     properties = db.relationship('Property', backref='host', lazy=True)
 
+
+def _geo_cell_default(context):
+    params = context.get_current_parameters()
+    return cell_key(params['latitude'], params['longitude'])
+
+
 class Property(db.Model):
     __tablename__ = 'properties'
     id = db.Column(db.Integer, primary_key=True)
-    host_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    host_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=False)
     location = db.Column(db.String(150), nullable=False)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)  # Enlem
     longitude = db.Column(db.Float, nullable=False) # Boylam
+    # Ev veya müsaitlik/rezervasyonları değiştikçe güncellenir; HTTP ETag'leri buna dayanır
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Konumun ızgara hücresi (bkz. geocell.py). Harita kutu sorguları ve kümeleme bu indeksli kolonu kullanır;
+    # Core ile yapılan toplu insert'lerde de satır başına hesaplansın diye context'li default veriliyor.
+    geo_cell = db.Column(db.BigInteger, nullable=False, index=True,
+                         default=_geo_cell_default)
 
     reservations = db.relationship('Reservation', backref='property', lazy=True, cascade="all, delete-orphan")
     availabilities = db.relationship('Availability', backref='property', lazy=True, cascade="all, delete-orphan")
@@ -34,78 +61,96 @@ class Property(db.Model):
         return self.get_marker_color() == "green"
 
     def get_marker_color(self):
-        future_avails = [av for av in self.availabilities if av.end_date >= date.today()]
-        if not future_avails:
-            # Geleceğe dönük hiç müsaitlik yoksa ev tamamen dolu kabul,
-            # mantık gereği bu durumda boş gün de yok => red
-            return "red"
-
-        # Rezervasyonları durumlarına göre ayır
+        today = date.today()
+        future_avails = [(av.start_date, av.end_date) for av in self.availabilities if av.end_date >= today]
         pending_intervals = [(r.start_date, r.end_date) for r in self.reservations if r.status == 'pending']
         approved_intervals = [(r.start_date, r.end_date) for r in self.reservations if r.status == 'approved']
-
-        def day_reserved_status(d):
-            p = any(ps <= d <= pe for (ps, pe) in pending_intervals)
-            a = any(as_ <= d <= ae for (as_, ae) in approved_intervals)
-            return p, a
-
-        free_days = 0
-        pending_days = 0
-        approved_days = 0
-
-        # Tüm future_avails günlerini kontrol ediyoruz
-        for av in future_avails:
-            current_day = av.start_date
-            while current_day <= av.end_date:
-                # Bu günün durumunu kontrol et
-                p, a = day_reserved_status(current_day)
-
-                if not p and not a:
-                    # Gün serbest
-                    free_days += 1
-                elif p and not a:
-                    # Gün pending rezervasyonla dolu
-                    pending_days += 1
-                elif a and not p:
-                    # Gün approved rezervasyonla dolu
-                    approved_days += 1
-                else:
-                    # Hem pending hem approved olma ihtimali çok düşük,
-                    # ama yine de pending öncelikli sayıyoruz (ya da karışık durum sarıya gidecek)
-                    pending_days += 1
-                current_day += timedelta(days=1)
-
-        # Renk belirleme:
-        if free_days > 0:
-            return "green"
-        # Boş gün yok
-        if pending_days > 0 and approved_days == 0:
-            return "yellow"
-        elif approved_days > 0 and pending_days == 0:
-            return "red"
-        else:
-            # Karışık durum (hem pending hem approved) => yellow
-            return "yellow"
-
+        return marker_color(future_avails, pending_intervals, approved_intervals)
 
     def is_date_range_available(self, start_date, end_date):
-        in_availability = False
-        for av in self.availabilities:
-            if start_date >= av.start_date and end_date <= av.end_date:
-                in_availability = True
-                break
-        if not in_availability:
+        avails = merge_intervals((av.start_date, av.end_date) for av in self.availabilities)
+        if not covers(avails, start_date, end_date):
             return False
 
-        for r in self.reservations:
-            if r.status in ['pending', 'approved']:
-                if not (end_date < r.start_date or start_date > r.end_date):
-                    return False
-        return True
+        blocked = merge_intervals((r.start_date, r.end_date) for r in self.reservations
+                                  if r.status in ['pending', 'approved'])
+        return not overlaps(blocked, start_date, end_date)
+
+
+@event.listens_for(Property, 'before_update')
+def _update_geo_cell(mapper, connection, target):
+    target.geo_cell = cell_key(target.latitude, target.longitude)
+
+
+def marker_color(future_avails, pending_intervals, approved_intervals):
+    # Geleceğe dönük hiç müsaitlik yoksa ev tamamen dolu kabul,
+    # mantık gereği bu durumda boş gün de yok => red
+    if not future_avails:
+        return "red"
+
+    # Gün gün yürümek yerine aralık uç noktaları üzerinden sayıyoruz (bkz. intervals.day_counts)
+    free_days, pending_days, approved_days = day_counts(future_avails, pending_intervals, approved_intervals)
+
+    # Renk belirleme:
+    if free_days > 0:
+        return "green"
+    # Boş gün yok
+    if pending_days > 0 and approved_days == 0:
+        return "yellow"
+    elif approved_days > 0 and pending_days == 0:
+        return "red"
+    else:
+        # Karışık durum (hem pending hem approved) => yellow
+        return "yellow"
+
+
+def compute_marker_colors(property_ids=None):
+    """Birden fazla evin marker rengini sabit sayıda sorguyla hesaplar.
+
+    property_ids verilmezse tüm evler için hesaplanır. Dönen sözlük property_id -> renk şeklindedir.
+    """
+    if property_ids is None:
+        ids = [pid for (pid,) in db.session.query(Property.id)]
+        return _marker_colors_for(ids, filter_ids=False)
+
+    colors = {}
+    for chunk in chunked(property_ids):
+        colors.update(_marker_colors_for(chunk, filter_ids=True))
+    return colors
+
+
+def _marker_colors_for(ids, filter_ids):
+    today = date.today()
+    avails = defaultdict(list)
+    av_query = db.session.query(Availability.property_id, Availability.start_date, Availability.end_date) \
+        .filter(Availability.end_date >= today)
+    if filter_ids:
+        av_query = av_query.filter(Availability.property_id.in_(ids))
+    for pid, start, end in av_query:
+        avails[pid].append((start, end))
+
+    pending = defaultdict(list)
+    approved = defaultdict(list)
+    if avails:
+        # Sadece geleceğe dönük müsaitliklerle kesişebilecek rezervasyonları çekiyoruz
+        earliest = min(start for ranges in avails.values() for start, _ in ranges)
+        res_query = db.session.query(Reservation.property_id, Reservation.status,
+                                     Reservation.start_date, Reservation.end_date) \
+            .filter(Reservation.status.in_(['pending', 'approved']), Reservation.end_date >= earliest)
+        if filter_ids:
+            res_query = res_query.filter(Reservation.property_id.in_(list(avails)))
+        for pid, status, start, end in res_query:
+            if pid in avails:
+                (pending if status == 'pending' else approved)[pid].append((start, end))
+
+    return {pid: marker_color(avails.get(pid, []), pending.get(pid, []), approved.get(pid, []))
+            for pid in ids}
 
 
 class Availability(db.Model):
     __tablename__ = 'availability'
+    # Tarih aralığı aramaları evin aralıklarını bu indeks üzerinden tarar
+    __table_args__ = (db.Index('ix_availability_property_dates', 'property_id', 'start_date', 'end_date'),)
     id = db.Column(db.Integer, primary_key=True)
     property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
@@ -114,13 +159,46 @@ class Availability(db.Model):
 
 class Reservation(db.Model):
     __tablename__ = 'reservations'
+    # Çakışma kontrolleri her zaman property_id + status ile filtreliyor
+    __table_args__ = (db.Index('ix_reservations_property_status', 'property_id', 'status'),)
     id = db.Column(db.Integer, primary_key=True)
     property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     date = db.Column(db.DateTime, nullable=False)
-    status = db.Column(db.String(10), nullable=False)  # 'pending', 'approved', 'rejected', 'canceled'
+    status = db.Column(db.String(10), nullable=False, index=True)  # 'pending', 'approved', 'rejected', 'canceled'
     start_date = db.Column(db.Date, nullable=True)
     end_date = db.Column(db.Date, nullable=True)
     cancel_reason = db.Column(db.String(255), nullable=True)
 
     user = db.relationship('User', backref='reservations')
+
+
+# PostgreSQL'de aynı ev için çakışan pending/approved rezervasyonları veritabanı seviyesinde engelle.
+# Diğer veritabanlarında booking.reserve içindeki koşullu INSERT yeterlidir.
+event.listen(
+    Reservation.__table__, 'after_create',
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist; "
+           "ALTER TABLE reservations ADD CONSTRAINT reservations_no_overlap "
+           "EXCLUDE USING gist (property_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+           "WHERE (status IN ('pending', 'approved'))").execute_if(dialect='postgresql')
+)
+
+
+class PropertyStatus(db.Model):
+    # Marker rengi önbelleği; computed_on bugünden farklıysa kayıt bayat kabul edilir.
+    __tablename__ = 'property_status'
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), primary_key=True)
+    color = db.Column(db.String(10), nullable=False)
+    computed_on = db.Column(db.Date, nullable=False)
+
+
+class PropertyMonthStats(db.Model):
+    # Ev başına aylık doluluk ve gelir özeti; rezervasyon/müsaitlik değiştikçe analytics.refresh_property ile güncellenir.
+    __tablename__ = 'property_month_stats'
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id'), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # ayın ilk günü
+    booked_nights = db.Column(db.Integer, nullable=False, default=0)
+    pending_nights = db.Column(db.Integer, nullable=False, default=0)
+    free_nights = db.Column(db.Integer, nullable=False, default=0)
+    projected_revenue = db.Column(db.Float, nullable=False, default=0)
+    pending_revenue = db.Column(db.Float, nullable=False, default=0)
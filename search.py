@@ -0,0 +1,82 @@
+# search.py
+# Ev listeleme ve arama sorguları: fiyat/tarih filtreleri ve keyset (cursor) sayfalama.
+# Müsaitlik kontrolü Python'da ev ev yapılmaz; EXISTS alt sorgularıyla veritabanında yapılır.
+from datetime import datetime
+
+from sqlalchemy import exists, and_, or_
+
+from models import Property, Availability, Reservation
+
+
+def parse_date(value):
+    """YYYY-MM-DD formatındaki metni date'e çevirir (request.args.get(type=...) ile kullanılır)."""
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def available_between(query, start_date, end_date):
+    """Sorguyu [start_date, end_date] aralığında kiralanabilir evlerle sınırlar."""
+    covered = exists().where(Availability.property_id == Property.id,
+                             Availability.start_date <= start_date,
+                             Availability.end_date >= end_date)
+    blocked = exists().where(Reservation.property_id == Property.id,
+                             Reservation.status.in_(['pending', 'approved']),
+                             Reservation.start_date <= end_date,
+                             Reservation.end_date >= start_date)
+    return query.filter(covered, ~blocked)
+
+
+def filter_properties(query, min_price=None, max_price=None, start_date=None, end_date=None):
+    if min_price is not None:
+        query = query.filter(Property.price >= min_price)
+    if max_price is not None:
+        query = query.filter(Property.price <= max_price)
+    if start_date and end_date and start_date <= end_date:
+        query = available_between(query, start_date, end_date)
+    return query
+
+
+def keyset_page(query, after_id, per_page):
+    """id'ye göre sıralı bir sayfa ve bir sonraki sayfanın cursor'ını döndürür.
+
+    OFFSET kullanmadığımız için sayfa ne kadar ileride olursa olsun maliyet sabit kalır.
+    """
+    if after_id is not None:
+        query = query.filter(Property.id > after_id)
+    items = query.order_by(Property.id).limit(per_page + 1).all()
+    next_cursor = items[per_page - 1].id if len(items) > per_page else None
+    return items[:per_page], next_cursor
+
+
+def keyset_version(query, after_id, per_page):
+    """keyset_page'in aynı argümanlarla döndüreceği sayfanın (id, updated_at) listesi.
+
+    Sayfa ETag'i için kullanılır: sadece sayfadaki satırlar değişince sürüm değişir ve tüm tablo taranmaz.
+    """
+    if after_id is not None:
+        query = query.filter(Property.id > after_id)
+    return tuple(query.with_entities(Property.id, Property.updated_at).order_by(Property.id).limit(per_page + 1))
+
+
+def price_page(query, cursor, per_page, descending=False):
+    """(price, id) sırasına göre keyset sayfalama; cursor "fiyat,id" biçimindedir."""
+    if cursor:
+        price, last_id = _parse_price_cursor(cursor)
+        if descending:
+            query = query.filter(or_(Property.price < price, and_(Property.price == price, Property.id < last_id)))
+        else:
+            query = query.filter(or_(Property.price > price, and_(Property.price == price, Property.id > last_id)))
+    if descending:
+        query = query.order_by(Property.price.desc(), Property.id.desc())
+    else:
+        query = query.order_by(Property.price, Property.id)
+    items = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(items) > per_page:
+        last = items[per_page - 1]
+        next_cursor = '{!r},{}'.format(last.price, last.id)
+    return items[:per_page], next_cursor
+
+
+def _parse_price_cursor(cursor):
+    price, last_id = cursor.split(',', 1)
+    return float(price), int(last_id)
@@ -0,0 +1,97 @@
+# security.py
+# Parola hash'leme, giriş denemesi sınırlama ve rol kontrolü.
+# Hash algoritması ve maliyeti Config.PASSWORD_HASH_METHOD ile seçilir; eski parametrelerle saklanan
+# hash'ler başarılı girişte yeniden hesaplanır. Sınırlayıcı bellek içi kayan pencere kullanır,
+# harici bir servise ihtiyaç duymaz.
+import threading
+import time
+from collections import deque
+from functools import lru_cache, wraps
+
+from flask import current_app, flash, jsonify, redirect, url_for
+from flask_login import current_user
+from werkzeug.security import generate_password_hash
+
+
+def hash_password(password):
+    return generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def needs_rehash(stored_hash):
+    """Saklanan hash yapılandırılmış algoritma/maliyet ile üretilmemişse True."""
+    return stored_hash.split('$', 1)[0] != _canonical_method(current_app.config['PASSWORD_HASH_METHOD'])
+
+
+@lru_cache(maxsize=None)
+def _canonical_method(method):
+    # "pbkdf2:sha256" gibi kısa yazımlar werkzeug tarafından varsayılan maliyetle tamamlanır;
+    # karşılaştırma için hash'in önüne yazılan tam biçimi bir kez üretip saklıyoruz.
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def role_required(role, message='Bu sayfaya erişim izniniz yok.', as_json=False):
+    """Kullanıcının rolü uymuyorsa ana sayfaya yönlendirir (as_json ile 403 döner).
+
+    @login_required'ın altında kullanılmalıdır.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_user.role != role:
+                if as_json:
+                    return jsonify(error=message), 403
+                flash(message, 'danger')
+                return redirect(url_for('index'))
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class SlidingWindowLimiter:
+    """Anahtar başına son `window` saniyedeki olay sayısını `limit` ile sınırlar."""
+
+    def __init__(self, limit, window, clock=time.monotonic, max_keys=100000):
+        self.limit = limit
+        self.window = window
+        self.clock = clock
+        self.max_keys = max_keys
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def is_limited(self, key):
+        with self._lock:
+            events = self._events.get(key)
+            if not events:
+                return False
+            self._expire(events, self.clock())
+            return len(events) >= self.limit
+
+    def hit(self, key):
+        with self._lock:
+            now = self.clock()
+            events = self._events.get(key)
+            if events is None:
+                if len(self._events) >= self.max_keys:
+                    self._prune(now)
+                events = self._events[key] = deque()
+            self._expire(events, now)
+            events.append(now)
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._events.clear()
+            else:
+                self._events.pop(key, None)
+
+    def _expire(self, events, now):
+        while events and events[0] <= now - self.window:
+            events.popleft()
+
+    def _prune(self, now):
+        # Bellek sınırlı kalsın diye penceresi tamamen geçmiş anahtarları at
+        for key in [k for k, events in self._events.items() if not events or events[-1] <= now - self.window]:
+            del self._events[key]
+
+
+login_limiter = SlidingWindowLimiter(limit=10, window=300)
@@ -0,0 +1,59 @@
+// map_markers.js
+// Haritanın görünen alanına göre /api/map_markers'tan marker ve kümeleri yükler.
+// Harita her durduğunda (idle) yeni alan istenir; zaten çizilmiş marker'lar yeniden oluşturulmaz.
+function loadMarkersOnIdle(map, endpoint, options) {
+    const markers = new Map();   // property id -> marker
+    let clusters = [];
+    let controller = null;
+
+    function clearClusters() {
+        clusters.forEach(c => options.removeMarker(c));
+        clusters = [];
+    }
+
+    function refresh() {
+        const bounds = map.getBounds();
+        if (!bounds) {
+            return;
+        }
+        const ne = bounds.getNorthEast();
+        const sw = bounds.getSouthWest();
+        const params = new URLSearchParams({
+            north: ne.lat(), east: ne.lng(), south: sw.lat(), west: sw.lng(), zoom: map.getZoom()
+        });
+
+        // Önceki istek hâlâ sürüyorsa iptal et; sadece son görünüm önemli
+        if (controller) {
+            controller.abort();
+        }
+        controller = new AbortController();
+
+        fetch(endpoint + '?' + params.toString(), {signal: controller.signal})
+            .then(response => response.json())
+            .then(data => {
+                clearClusters();
+                const visible = new Set();
+                data.markers.forEach(item => {
+                    visible.add(item.id);
+                    if (!markers.has(item.id)) {
+                        markers.set(item.id, options.createMarker(item));
+                    }
+                });
+                // Görünen alandan çıkan marker'ları kaldır
+                markers.forEach((marker, id) => {
+                    if (!visible.has(id)) {
+                        options.removeMarker(marker);
+                        markers.delete(id);
+                    }
+                });
+                clusters = data.clusters.map(item => options.createCluster(item));
+            })
+            .catch(err => {
+                if (err.name !== 'AbortError') {
+                    console.error(err);
+                }
+            });
+    }
+
+    map.addListener('idle', refresh);
+}
@@ -0,0 +1,127 @@
+# status_cache.py
+# Evlerin marker rengini property_status tablosunda saklayan önbellek.
+# Renk sadece rezervasyon/müsaitlik değiştiğinde veya gün döndüğünde değişir; bu yüzden
+# yazma yapan route'lar invalidate() çağırır, bayat (dünden kalan) kayıtlar ise yok sayılır.
+import logging
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from models import db, Property, PropertyStatus, chunked, compute_marker_colors
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+_scheduler_pid = None
+
+
+def get_marker_colors(property_ids=None):
+    """property_id -> renk sözlüğü döndürür; önbellekte olmayanları hesaplayıp kaydeder."""
+    today = date.today()
+    query = db.session.query(PropertyStatus.property_id, PropertyStatus.color) \
+        .filter(PropertyStatus.computed_on == today)
+    if property_ids is None:
+        ids = [pid for (pid,) in db.session.query(Property.id)]
+        cached = dict(query)
+    else:
+        ids = list(property_ids)
+        cached = {}
+        for chunk in chunked(ids):
+            cached.update(query.filter(PropertyStatus.property_id.in_(chunk)))
+
+    colors = {pid: cached[pid] for pid in ids if pid in cached}
+    missing = [pid for pid in ids if pid not in cached]
+    _count(hits=len(colors), misses=len(missing))
+    if missing:
+        fresh = compute_marker_colors(missing)
+        colors.update(fresh)
+        _store(fresh, today)
+    return colors
+
+
+def invalidate(*property_ids):
+    """Verilen evlerin önbellek kayıtlarını siler. Çağıran tarafın commit'ine dahil olur."""
+    for chunk in chunked(property_ids):
+        PropertyStatus.query.filter(PropertyStatus.property_id.in_(chunk)) \
+            .delete(synchronize_session=False)
+
+
+def refresh(*property_ids):
+    """Evlerin rengini yeniden hesaplayıp önbelleğe yazar (arka plan işi olarak çalışır)."""
+    # Bu arada silinmiş evler atlanır
+    existing = []
+    for chunk in chunked(property_ids):
+        existing.extend(pid for (pid,) in db.session.query(Property.id).filter(Property.id.in_(chunk)))
+    _store(compute_marker_colors(existing), date.today())
+
+
+def refresh_all():
+    """Tüm evlerin rengini yeniden hesaplar (gece yarısı yenilemesi için)."""
+    colors = compute_marker_colors()
+    PropertyStatus.query.delete(synchronize_session=False)
+    _store(colors, date.today())
+
+
+def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def ensure_midnight_refresh(app):
+    """Zamanlayıcıyı süreç başına bir kez kurar; ilk istekte çağrılır.
+
+    Import sırasında thread başlatılmaz; böylece gunicorn fork'undan ve CLI komutlarından önce
+    zamanlayıcı oluşmaz, her worker kendi zamanlayıcısını ilk isteğinde kurar.
+    """
+    global _scheduler_pid
+    pid = os.getpid()
+    if _scheduler_pid == pid:
+        return
+    with _lock:
+        if _scheduler_pid == pid:
+            return
+        _scheduler_pid = pid
+    schedule_midnight_refresh(app)
+
+
+def schedule_midnight_refresh(app):
+    """Her gece yarısı önbelleği yenileyen bir arka plan zamanlayıcısı kurar."""
+    now = datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+
+    def run():
+        try:
+            with app.app_context():
+                refresh_all()
+        except Exception:
+            logger.exception('Gece yarısı durum önbelleği yenilemesi başarısız oldu')
+        schedule_midnight_refresh(app)
+
+    timer = threading.Timer((next_midnight - now).total_seconds(), run)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def _store(colors, computed_on):
+    if not colors:
+        return
+    # Eski (dünden kalan) kayıtları silip yenilerini ekliyoruz
+    invalidate(*colors)
+    db.session.execute(PropertyStatus.__table__.insert(),
+                       [{'property_id': pid, 'color': color, 'computed_on': computed_on}
+                        for pid, color in colors.items()])
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Başka bir worker aynı anda yazmış olabilir; önbellek yazımı en iyi çaba ile yapılır
+        db.session.rollback()
+
+
+def _count(hits, misses):
+    with _lock:
+        _stats['hits'] += hits
+        _stats['misses'] += misses
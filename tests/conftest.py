@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Modüller depo kökünde düz duruyor; testler nereden çalıştırılırsa çalıştırılsın import edilebilsin
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app import edilirken Config ortam değişkenlerinden okunur
+_db_file = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+_db_file.close()
+os.environ.setdefault('DATABASE_URL', 'sqlite:///' + _db_file.name)
+os.environ.setdefault('SECRET_KEY', 'test')
+os.environ.setdefault('STATUS_CACHE_MIDNIGHT_REFRESH', '0')
+# Testlerde parola hash'i ucuz olsun
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield flask_app
+    os.unlink(_db_file.name)
+
+
+@pytest.fixture
+def db(app):
+    # İstekler kendi uygulama bağlamlarını (ve oturumlarını) açabilsin diye burada bağlam açık tutulmaz
+    import identity
+    import security
+    from jobs import queue
+    from models import db as database
+    with app.app_context():
+        database.create_all()
+    yield database
+    queue.join(timeout=10)
+    with app.app_context():
+        database.drop_all()
+    identity.clear()
+    security.login_limiter.reset()
+
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app, db):
+    """Blok içinde çalışan SQL ifadelerini sayan bağlam yöneticisi döndürür."""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from jobs import queue
+
+    with app.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def count():
+        # Arka plan işlerinin ifadeleri sayıma karışmasın
+        queue.join(timeout=10)
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    return count
@@ -0,0 +1,84 @@
+# Müsaitlik aralıklarının artımlı güncellenmesi ve kaldırılan günlerle çakışan rezervasyonların iptali.
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import availability
+from jobs import queue
+from models import Availability, Property, Reservation, User
+from security import hash_password
+
+
+def d(day):
+    return date(2030, 1, 1) + timedelta(days=day)
+
+
+@pytest.fixture
+def property_id(app, db):
+    with app.app_context():
+        host = User(username='host', email='host@example.com', password=hash_password('pw'), role='host')
+        db.session.add(host)
+        db.session.flush()
+        prop = Property(host_id=host.id, title='Ev', description='-', location='-', price=100,
+                        latitude=41.0, longitude=29.0)
+        db.session.add(prop)
+        db.session.commit()
+        return prop.id
+
+
+def stored_rows(property_id):
+    return [(r.id, r.start_date, r.end_date)
+            for r in Availability.query.filter_by(property_id=property_id).order_by(Availability.start_date)]
+
+
+def test_adjacent_and_overlapping_adds_merge_into_one_row(app, db, property_id):
+    with app.app_context():
+        availability.apply_changes(property_id, add=[(d(0), d(4))])
+        db.session.commit()
+        availability.apply_changes(property_id, add=[(d(5), d(9)), (d(8), d(12))])
+        db.session.commit()
+        assert [(s, e) for _, s, e in stored_rows(property_id)] == [(d(0), d(12))]
+
+
+def test_remove_keeps_unrelated_rows_and_returns_removed_days(app, db, property_id):
+    with app.app_context():
+        availability.apply_changes(property_id, add=[(d(0), d(9)), (d(20), d(29))])
+        db.session.commit()
+        before = stored_rows(property_id)
+
+        removed = availability.apply_changes(property_id, remove=[(d(3), d(5)), (d(40), d(45))])
+        db.session.commit()
+
+        # Sadece gerçekten müsaitlikten çıkan günler döner
+        assert removed == [(d(3), d(5))]
+        after = stored_rows(property_id)
+        assert [(s, e) for _, s, e in after] == [(d(0), d(2)), (d(6), d(9)), (d(20), d(29))]
+        # Dokunulmayan aralığın satırı silinip yeniden eklenmez
+        assert before[1] in after
+
+
+def test_removing_days_cancels_only_touching_reservations(app, client, db, property_id):
+    with app.app_context():
+        availability.apply_changes(property_id, add=[(d(0), d(29))])
+        guest = User(username='guest', email='guest@example.com', password='-', role='user')
+        db.session.add(guest)
+        db.session.flush()
+        stays = {'before': (d(0), d(2)), 'touching': (d(4), d(6)), 'after': (d(8), d(9)),
+                 'approved': (d(5), d(5)), 'rejected': (d(5), d(6))}
+        for name, (start, end) in stays.items():
+            db.session.add(Reservation(property_id=property_id, user_id=guest.id, date=datetime(2029, 12, 1),
+                                       status=name if name in ('approved', 'rejected') else 'pending',
+                                       start_date=start, end_date=end))
+        db.session.commit()
+
+    client.post('/login', data={'email': 'host@example.com', 'password': 'pw'})
+    response = client.patch('/api/properties/{}/availability'.format(property_id),
+                            json={'remove': [{'start_date': d(5).isoformat(), 'end_date': d(6).isoformat()}]})
+    assert response.status_code == 200
+    assert response.get_json()['conflict_check_queued'] is True
+    queue.join(timeout=10)
+
+    with app.app_context():
+        statuses = {r.start_date: r.status for r in Reservation.query.filter(Reservation.status != 'rejected')}
+        assert statuses == {d(0): 'pending', d(4): 'canceled', d(8): 'pending', d(5): 'canceled'}
+        assert Reservation.query.filter_by(status='rejected').count() == 1
@@ -0,0 +1,59 @@
+# Rezervasyon oluşturma, onay ve red işlemleri.
+import random
+import threading
+from datetime import date, timedelta
+
+import booking
+from models import Availability, Property, Reservation, User
+
+START = date(2030, 1, 1)
+
+
+def test_concurrent_reservations_never_double_book(app, db):
+    with app.app_context():
+        host = User(username='host', email='host@example.com', password='-', role='host')
+        guest = User(username='guest', email='guest@example.com', password='-', role='user')
+        db.session.add_all([host, guest])
+        db.session.flush()
+        properties = [Property(host_id=host.id, title='Ev {}'.format(i), description='-', location='-',
+                               price=100, latitude=41.0, longitude=29.0) for i in range(2)]
+        db.session.add_all(properties)
+        db.session.flush()
+        db.session.add_all([Availability(property_id=p.id, start_date=START, end_date=START + timedelta(days=29))
+                            for p in properties])
+        db.session.commit()
+        property_ids, guest_id = [p.id for p in properties], guest.id
+
+    rng = random.Random(7)
+    attempts = []
+    for _ in range(8 * 50):
+        start = START + timedelta(days=rng.randrange(30))
+        attempts.append((rng.choice(property_ids), start, start + timedelta(days=rng.randint(0, 4))))
+    barrier = threading.Barrier(8)
+    outcomes = []
+    errors = []
+
+    def worker(chunk):
+        barrier.wait()
+        for property_id, start, end in chunk:
+            with app.app_context():
+                try:
+                    outcomes.append(booking.reserve(property_id, guest_id, start, end))
+                except Exception as e:
+                    errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(attempts[i::8],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert any(outcomes) and not all(outcomes)
+    with app.app_context():
+        rows = db.session.query(Reservation.property_id, Reservation.start_date, Reservation.end_date) \
+            .filter(Reservation.status.in_(['pending', 'approved'])).all()
+    assert len(rows) == sum(outcomes)
+    for i, a in enumerate(rows):
+        for b in rows[i + 1:]:
+            assert not (a.property_id == b.property_id and a.start_date <= b.end_date and b.start_date <= a.end_date)
@@ -0,0 +1,91 @@
+# Host'lar için toplu içe aktarma ve akışlı dışa aktarma uç noktaları.
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+
+from models import Availability, Property, Reservation, User
+from security import hash_password
+
+
+@pytest.fixture
+def hosts(app, db):
+    """(giriş yapan host'un evi, başka bir host'un evi) id'leri."""
+    with app.app_context():
+        users = [User(username='host{}'.format(i), email='host{}@example.com'.format(i),
+                      password=hash_password('pw'), role='host') for i in range(2)]
+        guest = User(username='guest', email='guest@example.com', password='-', role='user')
+        db.session.add_all(users + [guest])
+        db.session.flush()
+        own, other = [Property(host_id=u.id, title='Ev {}'.format(u.id), description='-', location='-',
+                               price=100, latitude=41.0, longitude=29.0) for u in users]
+        db.session.add_all([own, other])
+        db.session.flush()
+        for prop in (own, other):
+            db.session.add(Reservation(property_id=prop.id, user_id=guest.id, date=datetime(2029, 12, 1),
+                                       status='pending', start_date=date(2030, 1, 2), end_date=date(2030, 1, 4)))
+        db.session.commit()
+        return own.id, other.id
+
+
+@pytest.fixture
+def host_client(client, hosts):
+    client.post('/login', data={'email': 'host0@example.com', 'password': 'pw'})
+    return client
+
+
+def test_csv_property_import_reports_bad_rows(app, db, host_client):
+    body = ('title,description,location,price,latitude,longitude\n'
+            'Deniz evi,Manzaralı,İzmir,250,38.4,27.1\n'
+            'Eksik,,Ankara,100,39.9,32.8\n'
+            'Dağ evi,Şömineli,Bolu,180.5,40.7,31.6\n')
+    response = host_client.post('/api/host/import/properties',
+                                data={'file': (io.BytesIO(body.encode('utf-8')), 'evler.csv')},
+                                content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert report['error_count'] == 1
+    assert report['errors'][0]['line'] == 3
+    with app.app_context():
+        imported = Property.query.filter(Property.title.in_(['Deniz evi', 'Dağ evi'])).all()
+        assert sorted(p.price for p in imported) == [180.5, 250.0]
+        assert {p.host.email for p in imported} == {'host0@example.com'}
+
+
+def test_ndjson_availability_import_skips_other_hosts_properties(app, db, host_client, hosts):
+    own, other = hosts
+    lines = [{'property_id': own, 'start_date': '2030-03-01', 'end_date': '2030-03-05'},
+             {'property_id': own, 'start_date': '2030-03-06', 'end_date': '2030-03-09'},
+             {'property_id': other, 'start_date': '2030-03-01', 'end_date': '2030-03-05'}]
+    body = '\n'.join(json.dumps(line) for line in lines) + '\nbozuk satır\n'
+    response = host_client.post('/api/host/import/availability?format=ndjson', data=body.encode('utf-8'),
+                                content_type='application/x-ndjson')
+
+    report = response.get_json()
+    assert report['imported'] == 2
+    assert sorted(e['line'] for e in report['errors']) == [3, 4]
+    with app.app_context():
+        own_rows = [(a.start_date, a.end_date) for a in Availability.query.filter_by(property_id=own)]
+        assert own_rows == [(date(2030, 3, 1), date(2030, 3, 9))]
+        assert Availability.query.filter_by(property_id=other).count() == 0
+
+
+def test_reservation_export_streams_only_own_reservations(host_client, hosts):
+    own, _ = hosts
+    response = host_client.get('/api/host/export/reservations')
+    assert response.mimetype == 'text/csv'
+    assert 'reservations.csv' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [(int(r['property_id']), r['username'], r['start_date'], r['status']) for r in rows] == \
+        [(own, 'guest', '2030-01-02', 'pending')]
+
+    response = host_client.get('/api/host/export/reservations?format=ndjson')
+    assert response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [(r['property_id'], r['end_date'], r['cancel_reason']) for r in records] == [(own, '2030-01-04', None)]
+
+    assert host_client.get('/api/host/export/reservations?format=xml').status_code == 400
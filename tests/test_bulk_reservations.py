@@ -0,0 +1,74 @@
+# Host panosundan toplu onay / red.
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models import Property, Reservation, User
+from security import hash_password
+
+OVERLAP_REASON = 'Aynı tarihler için başka bir rezervasyon onaylandığı için talebiniz reddedildi.'
+
+
+def d(day):
+    return date(2030, 1, 1) + timedelta(days=day)
+
+
+@pytest.fixture
+def reservations(app, db):
+    """name -> reservation id. "other" başka bir host'un evine aittir."""
+    with app.app_context():
+        hosts = [User(username='host{}'.format(i), email='host{}@example.com'.format(i),
+                      password=hash_password('pw'), role='host') for i in range(2)]
+        guest = User(username='guest', email='guest@example.com', password='-', role='user')
+        db.session.add_all(hosts + [guest])
+        db.session.flush()
+        own, other = [Property(host_id=h.id, title='Ev', description='-', location='-', price=100,
+                               latitude=41.0, longitude=29.0) for h in hosts]
+        db.session.add_all([own, other])
+        db.session.flush()
+        stays = {'first': (own, d(0), d(3)), 'overlaps_first': (own, d(2), d(5)), 'third': (own, d(10), d(12)),
+                 'unselected': (own, d(11), d(11)), 'separate': (own, d(20), d(21)), 'other': (other, d(0), d(3))}
+        rows = {}
+        for name, (prop, start, end) in stays.items():
+            rows[name] = Reservation(property_id=prop.id, user_id=guest.id, date=datetime(2029, 12, 1),
+                                     status='pending', start_date=start, end_date=end)
+        db.session.add_all(rows.values())
+        db.session.commit()
+        return {name: r.id for name, r in rows.items()}
+
+
+def statuses(app, db, ids):
+    with app.app_context():
+        return {name: (r.status, r.cancel_reason)
+                for name, r in ((name, db.session.get(Reservation, rid)) for name, rid in ids.items())}
+
+
+def post_bulk(client, action, ids):
+    client.post('/login', data={'email': 'host0@example.com', 'password': 'pw'})
+    return client.post('/bulk_reservations', data={'action': action, 'reservation_ids': ids})
+
+
+def test_bulk_approve_rejects_overlapping_pending_requests(app, client, db, reservations):
+    r = reservations
+    response = post_bulk(client, 'approve', [r['first'], r['overlaps_first'], r['third'], r['other']])
+    assert response.status_code == 302
+
+    result = statuses(app, db, r)
+    assert result['first'] == ('approved', None)
+    # Aynı istekte onaylanan ilk rezervasyonla çakıştığı için ikinci seçim onaylanmaz
+    assert result['overlaps_first'] == ('rejected', OVERLAP_REASON)
+    assert result['third'] == ('approved', None)
+    assert result['unselected'] == ('rejected', OVERLAP_REASON)
+    assert result['separate'] == ('pending', None)
+    # Başka host'un rezervasyonu yok sayılır
+    assert result['other'] == ('pending', None)
+
+
+def test_bulk_reject_ignores_other_hosts_reservations(app, client, db, reservations):
+    r = reservations
+    post_bulk(client, 'reject', [r['first'], r['other']])
+
+    result = statuses(app, db, r)
+    assert result['first'][0] == 'rejected'
+    assert result['other'][0] == 'pending'
+    assert result['overlaps_first'][0] == 'pending'
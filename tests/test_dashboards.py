@@ -0,0 +1,52 @@
+# Rezervasyon panolarının sorgu sayısı rezervasyon sayısıyla büyümemeli (N+1 geri gelmesin).
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models import Property, Reservation, User
+from security import hash_password
+
+
+def seed(app, db, reservations):
+    with app.app_context():
+        _seed(db, reservations)
+
+
+def _seed(db, reservations):
+    host = User(username='host', email='host@example.com', password=hash_password('pw'), role='host')
+    guests = [User(username='guest{}'.format(i), email='guest{}@example.com'.format(i),
+                   password=hash_password('pw'), role='user') for i in range(3)]
+    db.session.add_all([host] + guests)
+    db.session.flush()
+    properties = [Property(host_id=host.id, title='Ev {}'.format(i), description='açıklama', location='İstanbul',
+                           price=100 + i, latitude=41.0, longitude=29.0) for i in range(5)]
+    db.session.add_all(properties)
+    db.session.flush()
+    start = date(2030, 1, 1)
+    for i in range(reservations):
+        db.session.add(Reservation(property_id=properties[i % len(properties)].id,
+                                   user_id=guests[0].id if i % 2 else guests[i % len(guests)].id,
+                                   date=datetime(2029, 12, 1), status=['pending', 'approved', 'rejected'][i % 3],
+                                   start_date=start + timedelta(days=3 * i),
+                                   end_date=start + timedelta(days=3 * i + 1)))
+    db.session.commit()
+
+
+def count_statements(client, query_counter, email, path):
+    client.post('/login', data={'email': email, 'password': 'pw'})
+    client.get(path)  # kullanıcı önbelleğini ısıt
+    with query_counter() as statements:
+        response = client.get(path)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('email, path, expected', [
+    ('guest0@example.com', '/my_rentals', 2),
+    ('host@example.com', '/my_rentals_host', 2),
+])
+@pytest.mark.parametrize('reservations', [6, 45])
+def test_dashboard_statement_count_is_constant(app, client, db, query_counter, email, path, expected, reservations):
+    seed(app, db, reservations)
+    # Sayfa sorgusu + sayfalama için COUNT; ev ve kullanıcı bilgileri join ile aynı sorguda gelir
+    assert count_statements(client, query_counter, email, path) == expected
@@ -0,0 +1,54 @@
+# user_loader önbelleği: sıcak önbellek users tablosuna gitmez, güncelleme/silme kaydı düşürür.
+import identity
+from models import User
+
+
+def add_user(db):
+    user = User(username='guest', email='guest@example.com', password='-', role='user')
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+    db.session.remove()
+    return user_id
+
+
+def test_warm_cache_skips_users_query(app, db, query_counter):
+    with app.app_context():
+        user_id = add_user(db)
+        identity.load(user_id)
+        db.session.remove()
+
+        with query_counter() as statements:
+            user = identity.load(user_id)
+            assert (user.username, user.role) == ('guest', 'user')
+        assert statements == []
+        assert identity.stats()['hits'] >= 1
+
+
+def test_update_invalidates_cached_user(app, db):
+    with app.app_context():
+        user_id = add_user(db)
+        identity.load(user_id)
+        db.session.remove()
+
+        user = db.session.get(User, user_id)
+        user.role = 'host'
+        db.session.commit()
+        db.session.remove()
+
+        misses = identity.stats()['misses']
+        assert identity.load(user_id).role == 'host'
+        assert identity.stats()['misses'] == misses + 1
+
+
+def test_delete_invalidates_cached_user(app, db):
+    with app.app_context():
+        user_id = add_user(db)
+        identity.load(user_id)
+        db.session.remove()
+
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        db.session.remove()
+
+        assert identity.load(user_id) is None
@@ -0,0 +1,124 @@
+# Aralık motorunun eski gün gün yürüyen hesapla aynı sonucu verdiğini rastgele girdilerle doğrular.
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from intervals import covers, merge_intervals, overlaps
+from models import Availability, Property, Reservation, marker_color
+
+BASE = date(2030, 1, 1)
+ONE_DAY = timedelta(days=1)
+
+
+def random_intervals(rng, count, span=60, max_len=10):
+    intervals = []
+    for _ in range(count):
+        start = BASE + timedelta(days=rng.randint(0, span))
+        intervals.append((start, start + timedelta(days=rng.randint(0, max_len))))
+    return intervals
+
+
+def disjoint_intervals(rng, count):
+    # Aralarında en az bir boş gün bulunan aralıklar (eski ve yeni kapsama kuralının aynı olduğu durum)
+    intervals = []
+    day = BASE + timedelta(days=rng.randint(0, 5))
+    for _ in range(count):
+        end = day + timedelta(days=rng.randint(0, 8))
+        intervals.append((day, end))
+        day = end + timedelta(days=rng.randint(2, 6))
+    rng.shuffle(intervals)
+    return intervals
+
+
+def old_marker_color(future_avails, pending_intervals, approved_intervals):
+    if not future_avails:
+        return "red"
+    free_days = pending_days = approved_days = 0
+    for start, end in future_avails:
+        day = start
+        while day <= end:
+            p = any(ps <= day <= pe for ps, pe in pending_intervals)
+            a = any(as_ <= day <= ae for as_, ae in approved_intervals)
+            if not p and not a:
+                free_days += 1
+            elif a and not p:
+                approved_days += 1
+            else:
+                pending_days += 1
+            day += ONE_DAY
+    if free_days > 0:
+        return "green"
+    if pending_days > 0 and approved_days == 0:
+        return "yellow"
+    if approved_days > 0 and pending_days == 0:
+        return "red"
+    return "yellow"
+
+
+def old_covers(rows, start, end):
+    return any(start >= s and end <= e for s, e in rows)
+
+
+def old_overlaps(rows, start, end):
+    return any(not (end < s or start > e) for s, e in rows)
+
+
+def make_property(avails, reservations):
+    return Property(availabilities=[Availability(start_date=s, end_date=e) for s, e in avails],
+                    reservations=[Reservation(start_date=s, end_date=e, status=status)
+                                  for (s, e), status in reservations])
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_marker_color_matches_day_walk(seed):
+    rng = random.Random(seed)
+    avails = random_intervals(rng, rng.randint(0, 4))
+    pending = random_intervals(rng, rng.randint(0, 4))
+    approved = random_intervals(rng, rng.randint(0, 4))
+    assert marker_color(avails, pending, approved) == old_marker_color(avails, pending, approved)
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_covers_and_overlaps_match_day_walk(seed):
+    rng = random.Random(seed)
+    rows = disjoint_intervals(rng, rng.randint(0, 5))
+    merged = merge_intervals(rows)
+    overlapping_rows = random_intervals(rng, rng.randint(0, 5))
+    for _ in range(20):
+        start = BASE + timedelta(days=rng.randint(-5, 70))
+        end = start + timedelta(days=rng.randint(0, 12))
+        assert covers(merged, start, end) == old_covers(rows, start, end)
+        assert overlaps(merge_intervals(overlapping_rows), start, end) == old_overlaps(overlapping_rows, start, end)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_is_date_range_available_matches_day_walk(seed):
+    rng = random.Random(seed)
+    avails = disjoint_intervals(rng, rng.randint(1, 4))
+    reservations = [(r, rng.choice(['pending', 'approved', 'rejected', 'canceled']))
+                    for r in random_intervals(rng, rng.randint(0, 4))]
+    prop = make_property(avails, reservations)
+    blocked = [r for r, status in reservations if status in ('pending', 'approved')]
+    for _ in range(20):
+        start = BASE + timedelta(days=rng.randint(-5, 70))
+        end = start + timedelta(days=rng.randint(0, 12))
+        expected = old_covers(avails, start, end) and not old_overlaps(blocked, start, end)
+        assert prop.is_date_range_available(start, end) == expected
+
+
+def test_reversed_range_is_not_available():
+    # Eski kod start > end aralığını kapsanmış sayabiliyordu; artık her zaman False
+    prop = make_property([(BASE, BASE + timedelta(days=10))], [])
+    start, end = BASE + timedelta(days=5), BASE + timedelta(days=3)
+    assert old_covers([(BASE, BASE + timedelta(days=10))], start, end)
+    assert not prop.is_date_range_available(start, end)
+    assert not covers([(BASE, BASE + timedelta(days=10))], start, end)
+
+
+def test_range_spanning_adjacent_rows_is_available():
+    # Bitişik iki müsaitlik satırına yayılan konaklama eskiden reddediliyordu; artık kabul ediliyor
+    rows = [(BASE, BASE + timedelta(days=4)), (BASE + timedelta(days=5), BASE + timedelta(days=9))]
+    start, end = BASE + timedelta(days=3), BASE + timedelta(days=6)
+    assert not old_covers(rows, start, end)
+    assert make_property(rows, []).is_date_range_available(start, end)
@@ -0,0 +1,79 @@
+# İlk sürümün şemasıyla oluşturulmuş bir veritabanı init-db ile güncel şemaya yükseltilebilmeli.
+from datetime import date, datetime
+
+from sqlalchemy import (Column, Date, DateTime, Float, ForeignKey, Integer, MetaData, String, Table, Text,
+                        inspect)
+
+import database
+import geocell
+from models import Availability, Property
+
+BASELINE = MetaData()
+Table('users', BASELINE,
+      Column('id', Integer, primary_key=True),
+      Column('username', String(150), nullable=False, unique=True),
+      Column('email', String(150), nullable=False, unique=True),
+      Column('password', String(256), nullable=False),
+      Column('role', String(10), nullable=False))
+Table('properties', BASELINE,
+      Column('id', Integer, primary_key=True),
+      Column('host_id', Integer, ForeignKey('users.id'), nullable=False),
+      Column('title', String(150), nullable=False),
+      Column('description', Text, nullable=False),
+      Column('location', String(150), nullable=False),
+      Column('price', Float, nullable=False),
+      Column('latitude', Float, nullable=False),
+      Column('longitude', Float, nullable=False))
+Table('availability', BASELINE,
+      Column('id', Integer, primary_key=True),
+      Column('property_id', Integer, ForeignKey('properties.id'), nullable=False),
+      Column('start_date', Date, nullable=False),
+      Column('end_date', Date, nullable=False))
+Table('reservations', BASELINE,
+      Column('id', Integer, primary_key=True),
+      Column('property_id', Integer, ForeignKey('properties.id'), nullable=False),
+      Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+      Column('date', DateTime, nullable=False),
+      Column('status', String(10), nullable=False),
+      Column('start_date', Date, nullable=True),
+      Column('end_date', Date, nullable=True),
+      Column('cancel_reason', String(255), nullable=True))
+
+
+def test_init_db_upgrades_baseline_schema(app, db):
+    with app.app_context():
+        db.drop_all()
+        BASELINE.create_all(db.engine)
+        with db.engine.begin() as conn:
+            conn.execute(BASELINE.tables['users'].insert(),
+                         {'id': 1, 'username': 'host', 'email': 'host@example.com', 'password': 'x', 'role': 'host'})
+            conn.execute(BASELINE.tables['properties'].insert(),
+                         {'id': 1, 'host_id': 1, 'title': 'Ev', 'description': 'açıklama', 'location': 'İstanbul',
+                          'price': 100.0, 'latitude': 41.0, 'longitude': 29.0})
+            conn.execute(BASELINE.tables['availability'].insert(), [
+                {'property_id': 1, 'start_date': date(2030, 1, 1), 'end_date': date(2030, 1, 5)},
+                {'property_id': 1, 'start_date': date(2030, 1, 6), 'end_date': date(2030, 1, 10)},
+                {'property_id': 1, 'start_date': date(2030, 1, 8), 'end_date': date(2030, 1, 12)},
+                {'property_id': 1, 'start_date': date(2030, 2, 1), 'end_date': date(2030, 2, 3)},
+            ])
+            conn.execute(BASELINE.tables['reservations'].insert(),
+                         {'property_id': 1, 'user_id': 1, 'date': datetime(2029, 12, 1), 'status': 'pending',
+                          'start_date': date(2030, 1, 2), 'end_date': date(2030, 1, 3)})
+
+        database.init_db()
+
+        applied = {m.id for m in database.SchemaMigration.query.all()}
+        assert applied == {migration_id for migration_id, _ in database.MIGRATIONS}
+        indexes = {i['name'] for i in inspect(db.engine).get_indexes('properties')}
+        assert {'ix_properties_geo_cell', 'ix_properties_host_id', 'ix_properties_price'} <= indexes
+        prop = db.session.get(Property, 1)
+        assert prop.updated_at is not None
+        assert prop.geo_cell == geocell.cell_key(41.0, 29.0)
+        rows = Availability.query.filter_by(property_id=1).order_by(Availability.start_date).all()
+        assert [(r.start_date, r.end_date) for r in rows] == [(date(2030, 1, 1), date(2030, 1, 12)),
+                                                               (date(2030, 2, 1), date(2030, 2, 3))]
+
+        # Tekrar çalıştırmak bir şey değiştirmemeli
+        database.init_db()
+        assert Availability.query.filter_by(property_id=1).count() == 2
+        db.session.remove()
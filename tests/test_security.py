@@ -0,0 +1,92 @@
+# Parola hash'i yenileme ve giriş denemesi sınırlayıcısı.
+import pytest
+from werkzeug.security import check_password_hash, generate_password_hash
+
+import app as app_module
+import security
+from models import User
+
+
+def add_user(app, db, email, password_hash):
+    with app.app_context():
+        db.session.add(User(username=email.split('@')[0], email=email, password=password_hash, role='user'))
+        db.session.commit()
+
+
+def security_hash(app, password):
+    with app.app_context():
+        return security.hash_password(password)
+
+
+@pytest.fixture
+def password_checks(monkeypatch):
+    calls = []
+
+    def counting_check(stored, password):
+        calls.append(stored)
+        return check_password_hash(stored, password)
+
+    monkeypatch.setattr(app_module, 'check_password_hash', counting_check)
+    return calls
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(security.login_limiter, 'limit', 3)
+    return security.login_limiter
+
+
+def test_sliding_window_expires_old_events():
+    now = [0.0]
+    limiter = security.SlidingWindowLimiter(limit=2, window=10, clock=lambda: now[0])
+    limiter.hit('a')
+    now[0] = 4
+    limiter.hit('a')
+    assert limiter.is_limited('a')
+    assert not limiter.is_limited('b')
+    now[0] = 10.5
+    # İlk deneme pencereden çıktı, ikincisi hâlâ içeride
+    assert not limiter.is_limited('a')
+    limiter.hit('a')
+    assert limiter.is_limited('a')
+    now[0] = 30
+    assert not limiter.is_limited('a')
+
+
+def test_login_is_limited_per_ip_before_password_check(app, client, db, limiter, password_checks):
+    add_user(app, db, 'guest@example.com', security_hash(app, 'pw'))
+    for i in range(3):
+        response = client.post('/login', data={'email': 'guest{}@example.com'.format(i), 'password': 'bad'})
+        assert response.status_code == 200
+    checks = len(password_checks)
+
+    response = client.post('/login', data={'email': 'guest@example.com', 'password': 'pw'})
+    assert response.status_code == 429
+    assert len(password_checks) == checks
+
+
+def test_login_is_limited_per_email_before_password_check(app, client, db, limiter, password_checks):
+    add_user(app, db, 'guest@example.com', security_hash(app, 'pw'))
+    for i in range(3):
+        client.post('/login', data={'email': 'guest@example.com', 'password': 'bad'},
+                    environ_base={'REMOTE_ADDR': '10.0.0.{}'.format(i)})
+    assert len(password_checks) == 3
+
+    response = client.post('/login', data={'email': 'Guest@Example.com', 'password': 'pw'},
+                           environ_base={'REMOTE_ADDR': '10.0.0.99'})
+    assert response.status_code == 429
+    assert len(password_checks) == 3
+
+
+def test_successful_login_rehashes_outdated_password(app, client, db, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:2000')
+    add_user(app, db, 'guest@example.com', generate_password_hash('pw', method='pbkdf2:sha256:1000'))
+
+    response = client.post('/login', data={'email': 'guest@example.com', 'password': 'pw'})
+    assert response.status_code == 302
+
+    with app.app_context():
+        stored = User.query.filter_by(email='guest@example.com').one().password
+        assert stored.startswith('pbkdf2:sha256:2000$')
+        assert check_password_hash(stored, 'pw')
+        assert not security.needs_rehash(stored)